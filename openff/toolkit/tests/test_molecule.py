@@ -336,6 +336,41 @@ class TestAtom:
         with pytest.raises(AssertionError, match="already has an associated molecule"):
             atom.molecule = mol
 
+    def test_molecule_indices(self):
+        """Test that cached atom and bond indices match their position in the molecule"""
+        mol = Molecule.from_smiles("CCO")
+        for index, atom in enumerate(mol.atoms):
+            assert atom.molecule_atom_index == index
+            assert atom.molecule_particle_index == index
+            # Check the cached value on repeated access
+            assert atom.molecule_atom_index == index
+        for index, bond in enumerate(mol.bonds):
+            assert bond.molecule_bond_index == index
+            assert bond.atom1_index == mol.atoms.index(bond.atom1)
+            assert bond.atom2_index == mol.atoms.index(bond.atom2)
+
+    def test_virtual_particle_indices(self):
+        """Test that virtual particles are indexed after all atoms, in virtual site order"""
+        mol = Molecule.from_smiles("CCO")
+        carbons = [atom for atom in mol.atoms if atom.atomic_number == 6]
+        first = mol.add_bond_charge_virtual_site(
+            carbons,
+            0.1 * unit.angstrom,
+            orientations=[(0, 1), (1, 0)],
+        )
+        second = mol.add_bond_charge_virtual_site(
+            [mol.atoms[1], mol.atoms[2]], 0.1 * unit.angstrom
+        )
+        assert (first, second) == (0, 1)
+        for index, vsite in enumerate(mol.virtual_sites):
+            assert vsite.molecule_virtual_site_index == index
+        particles = mol.particles
+        assert len(particles) == mol.n_atoms + sum(
+            vsite.n_particles for vsite in mol.virtual_sites
+        )
+        for index, particle in enumerate(particles):
+            assert particle.molecule_particle_index == index
+
 
 class TestMolecule:
     """Test Molecule class."""
@@ -682,6 +717,11 @@ class TestMolecule:
             assert mol._cached_smiles != {cache_key: None}
             assert len(mol._cached_smiles) == 2
 
+            # copies start out with the SMILES already cached for the original
+            mol_copy = Molecule(mol)
+            assert mol_copy._cached_smiles == mol._cached_smiles
+            assert mol_copy._cached_smiles is not mol._cached_smiles
+
         else:
             pytest.skip(
                 f"The required toolkit ({toolkit_class.toolkit_name}) is not available."
@@ -2527,6 +2567,10 @@ class TestMolecule:
         assert molecule.n_conformers == 3
         assert molecule.conformers[2][0][0] == 10.0 * unit.angstrom
 
+        # Conformers should not share memory with the input coordinates
+        conf1[0][0] = 0.0 * unit.angstrom
+        assert molecule.conformers[0][0][0] == 1.0 * unit.angstrom
+
         # Add a conformer with units of nanometers
         conf_nonsense_units = unit.Quantity(
             np.array(
@@ -13,6 +13,7 @@ Tests for Topology
 # GLOBAL IMPORTS
 # =============================================================================================
 
+import itertools
 from unittest import TestCase
 
 import numpy as np
@@ -33,11 +34,13 @@ from openff.toolkit.tests.utils import (
 )
 from openff.toolkit.topology import (
     DuplicateUniqueMoleculeError,
+    FrozenMolecule,
     ImproperDict,
     InvalidBoxVectorsError,
     InvalidPeriodicityError,
     MissingUniqueMoleculesError,
     Molecule,
+    SortedDict,
     Topology,
     ValenceDict,
 )
@@ -102,6 +105,54 @@ def test_cheminformatics_toolkit_is_installed():
         raise Exception(msg)
 
 
+class TestTransformedDict:
+    """Test the key-transforming dictionaries used to store valence terms."""
+
+    def test_valence_dict(self):
+        """Test that ValenceDict treats reversed keys as identical"""
+        valence_dict = ValenceDict({(2, 1, 0): "a"})
+        assert (0, 1, 2) in valence_dict
+        assert (2, 1, 0) in valence_dict
+        assert (0, 2, 1) not in valence_dict
+        valence_dict[(3, 0)] = "b"
+        assert valence_dict[(0, 3)] == "b"
+        assert len(valence_dict) == 2
+        # Iteration is sorted by transformed key
+        assert list(valence_dict) == [(0, 1, 2), (0, 3)]
+        del valence_dict[(2, 1, 0)]
+        assert list(valence_dict.items()) == [((0, 3), "b")]
+
+    def test_improper_dict(self):
+        """Test that ImproperDict treats permutations around the central atom as identical"""
+        improper_dict = ImproperDict()
+        improper_dict[(3, 0, 1, 2)] = "a"
+        for key in [(1, 0, 2, 3), (2, 0, 3, 1), (3, 0, 2, 1)]:
+            assert key in improper_dict
+            assert improper_dict[key] == "a"
+        assert (0, 1, 2, 3) not in improper_dict
+        assert list(improper_dict) == [(1, 0, 2, 3)]
+
+    def test_improper_key_transform(self):
+        """Test that ImproperDict sorts the connected atoms of every permutation"""
+        for atom1, atom3, atom4 in itertools.permutations([4, 7, 9]):
+            assert ImproperDict.key_transform((atom1, 0, atom3, atom4)) == (4, 0, 7, 9)
+        # Repeated indices are sorted the same way
+        assert ImproperDict.key_transform([2, 0, 1, 2]) == (1, 0, 2, 2)
+
+    @pytest.mark.parametrize("dict_class", [ValenceDict, ImproperDict, SortedDict])
+    def test_from_array(self, dict_class):
+        """Test that building a dictionary from an array matches item assignment"""
+        keys = np.array([[3, 1, 0, 2], [0, 2, 1, 3], [2, 3, 1, 0]], dtype=np.int32)
+        values = ["a", "b", "c"]
+        expected = dict_class()
+        for key, value in zip(keys.tolist(), values):
+            expected[key] = value
+        from_array = dict_class.from_array(keys, values)
+        assert list(from_array.items()) == list(expected.items())
+        assert all(type(index) is int for key in from_array for index in key)
+        assert len(dict_class.from_array([], [])) == 0
+
+
 # TODO: Refactor this to pytest
 class TestTopology(TestCase):
     def setUp(self):
@@ -254,6 +305,26 @@ class TestTopology(TestCase):
         assert topology.box_vectors is None
         assert len(topology.constrained_atom_pairs.items()) == 0
 
+    def test_add_constraint(self):
+        """Test that constraints are found with the atoms in either order"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_constraint(3, 1)
+        assert topology.is_constrained(1, 3) is True
+        assert topology.is_constrained(3, 1) is True
+        assert topology.is_constrained(1, 2) is False
+        assert topology.constrained_atom_pairs == {(1, 3): True, (3, 1): True}
+
+        distance = 1.1 * unit.angstrom
+        topology.add_constraint(1, 3, distance)
+        assert topology.is_constrained(3, 1) == distance
+        with pytest.raises(Exception, match="already constrained"):
+            topology.add_constraint(3, 1)
+
+        topology.add_constraint(3, 1, False)
+        assert topology.is_constrained(1, 3) is False
+        assert len(topology.constrained_atom_pairs.items()) == 0
+
     def test_from_smiles_unique_mols(self):
         """Test the addition of two different molecules to a topology"""
         topology = Topology.from_molecules(
@@ -321,6 +392,251 @@ class TestTopology(TestCase):
         with self.assertRaises(Exception) as context:
             topology_atom = topology.atom(8)
 
+    def test_atom_topology_indices(self):
+        """Test topology atom indices of TopologyMolecules with a non-trivial atom mapping"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        n_atoms = self.propane_from_smiles.n_atoms
+        reversed_mapping = {i: n_atoms - 1 - i for i in range(n_atoms)}
+        topology.add_molecule(
+            self.propane_from_smiles, local_topology_to_reference_index=reversed_mapping
+        )
+
+        for index, topology_atom in enumerate(topology.topology_atoms):
+            assert topology_atom.topology_atom_index == index
+            assert type(topology_atom.topology_atom_index) is int
+
+        assert topology.topology_molecules[1].atom_start_topology_index == 8
+        assert topology.topology_molecules[1].bond_start_topology_index == 7
+
+        all_indices = topology.all_atom_topology_indices()
+        assert all_indices.shape == (19,)
+        assert list(all_indices[:8]) == list(range(8))
+        assert list(all_indices[8:]) == list(reversed(range(8, 19)))
+
+        topology.add_molecule(self.propane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+        all_indices = topology.all_atom_topology_indices()
+        assert all_indices.dtype == np.int32
+        assert list(all_indices[19:]) == list(range(19, 41))
+
+    def test_lookup_by_topology_index(self):
+        """Test that atoms, bonds and virtual sites are found by topology index across molecules"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(Molecule.from_smiles("[Na+]"))
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        topology.add_molecule(Molecule.from_smiles("[Cl-]"))
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+
+        for index, topology_atom in enumerate(topology.topology_atoms):
+            assert topology.atom(index) is topology_atom
+        for index, topology_bond in enumerate(topology.topology_bonds):
+            assert topology.bond(index) is topology_bond
+        for index, topology_vsite in enumerate(topology.topology_virtual_sites):
+            assert topology.virtual_site(index) == topology_vsite
+            assert topology.virtual_site(index).topology_virtual_site_index == index
+
+    def test_chemical_environment_matches_after_add_molecule(self):
+        """Test that repeated SMARTS queries follow molecules added in between"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        matches = topology.chemical_environment_matches("[#6:1]-[#1:2]")
+        assert len(matches) == 6
+        assert [match.topology_atom_indices for match in matches] == [
+            match.topology_atom_indices
+            for match in topology.chemical_environment_matches("[#6:1]-[#1:2]")
+        ]
+
+        topology.add_molecule(self.propane_from_smiles)
+        matches = topology.chemical_environment_matches("[#6:1]-[#1:2]")
+        assert len(matches) == 14
+        assert max(max(match.topology_atom_indices) for match in matches) == 18
+
+    def test_atom_property_arrays(self):
+        """Test that per-atom property arrays follow topology atom order"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        n_atoms = self.propane_from_smiles.n_atoms
+        reversed_mapping = {i: n_atoms - 1 - i for i in range(n_atoms)}
+        topology.add_molecule(
+            self.propane_from_smiles, local_topology_to_reference_index=reversed_mapping
+        )
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+
+        atomic_numbers = topology.atomic_numbers_array()
+        masses = topology.masses_array()
+        assert atomic_numbers.shape == (topology.n_topology_atoms,)
+        for index, topology_atom in enumerate(topology.topology_atoms):
+            assert atomic_numbers[index] == topology_atom.atomic_number
+            assert masses[index] == topology_atom.atom.mass
+
+        assert Topology().atomic_numbers_array().shape == (0,)
+
+    def test_topology_molecule_property_arrays(self):
+        """Test that TopologyMolecule per-atom arrays follow TopologyMolecule atom order"""
+        propane = Molecule(self.propane_from_smiles)
+        propane.partial_charges = (
+            np.linspace(-0.5, 0.5, propane.n_atoms) * unit.elementary_charge
+        )
+        n_atoms = propane.n_atoms
+        reversed_mapping = {i: n_atoms - 1 - i for i in range(n_atoms)}
+        topology = Topology()
+        topology.add_molecule(propane)
+        topology.add_molecule(
+            propane, local_topology_to_reference_index=reversed_mapping
+        )
+
+        for topology_molecule in topology.topology_molecules:
+            atomic_numbers = topology_molecule.atomic_numbers
+            formal_charges = topology_molecule.formal_charges
+            partial_charges = topology_molecule.partial_charges
+            for index, topology_atom in enumerate(topology_molecule.atoms):
+                assert atomic_numbers[index] == topology_atom.atomic_number
+                assert formal_charges[index] == topology_atom.atom.formal_charge / (
+                    unit.elementary_charge
+                )
+                assert partial_charges[index] == topology_atom.atom.partial_charge
+
+        # With the default mapping, atomic numbers are a read-only view of the reference array
+        topology_molecule = topology.topology_molecules[0]
+        atomic_numbers = topology_molecule.atomic_numbers
+        assert np.shares_memory(
+            atomic_numbers, topology_molecule.reference_molecule._atomic_numbers_array
+        )
+        assert not atomic_numbers.flags.writeable
+
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        assert topology.topology_molecules[0].partial_charges is None
+
+    def test_add_molecule_stores_frozen_molecules_without_copying(self):
+        """Test that FrozenMolecules become reference molecules as they are, while Molecules are copied"""
+        frozen_ethane = FrozenMolecule(self.ethane_from_smiles)
+        topology = Topology()
+        topology.add_molecule(frozen_ethane)
+        topology.add_molecule(self.propane_from_smiles)
+        frozen_reference, propane_reference = topology.reference_molecules
+        assert frozen_reference is frozen_ethane
+        assert propane_reference is not self.propane_from_smiles
+        assert type(propane_reference) is FrozenMolecule
+
+    def test_topology_molecules_share_atom_mappings(self):
+        """Test that copies of a molecule with the same atom order share their index mappings"""
+        topology = Topology()
+        topology.add_molecule(self.propane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+        n_atoms = self.propane_from_smiles.n_atoms
+        reversed_mapping = {i: n_atoms - 1 - i for i in range(n_atoms)}
+        topology.add_molecule(
+            self.propane_from_smiles, local_topology_to_reference_index=reversed_mapping
+        )
+
+        first, second, reversed_copy = topology.topology_molecules
+        assert second._top_to_ref_index is first._top_to_ref_index
+        assert second._ref_to_top_index is first._ref_to_top_index
+        assert second._atom_offsets is first._atom_offsets
+        assert second.atom_start_topology_index == first.n_atoms
+        assert reversed_copy._top_to_ref_index is not first._top_to_ref_index
+        for topology_molecule in topology.topology_molecules:
+            for index, topology_atom in enumerate(topology_molecule.atoms):
+                assert topology_atom.topology_molecule is topology_molecule
+                assert topology_molecule.atom(index) is topology_atom
+                assert topology_atom.topology_atom_index == (
+                    topology_molecule.atom_start_topology_index + index
+                )
+
+    def test_bond_topology_atom_indices(self):
+        """Test that bond atom index arrays follow the bonds of each TopologyMolecule"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        n_atoms = self.propane_from_smiles.n_atoms
+        reversed_mapping = {i: n_atoms - 1 - i for i in range(n_atoms)}
+        topology.add_molecule(
+            self.propane_from_smiles, local_topology_to_reference_index=reversed_mapping
+        )
+
+        for topology_molecule in topology.topology_molecules:
+            bond_indices = topology_molecule.bond_topology_atom_indices
+            assert bond_indices.shape == (topology_molecule.n_bonds, 2)
+            for topology_bond, (index1, index2) in zip(
+                topology_molecule.bonds, bond_indices
+            ):
+                atom1, atom2 = topology_bond.atoms
+                assert index1 == atom1.topology_atom_index
+                assert index2 == atom2.topology_atom_index
+
+    def test_topology_atoms_are_reused(self):
+        """Test that repeated access returns the same TopologyAtom and TopologyBond instances"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+
+        assert list(topology.topology_atoms) == list(topology.topology_atoms)
+        for topology_atom, other in zip(
+            topology.topology_atoms, topology.topology_atoms
+        ):
+            assert topology_atom is other
+        for topology_bond in topology.topology_bonds:
+            assert topology_bond is topology.bond(topology_bond.topology_bond_index)
+            for topology_atom in topology_bond.atoms:
+                assert topology_atom is topology.atom(topology_atom.topology_atom_index)
+
+    def test_pickle_topology_atoms_and_bonds(self):
+        """Test that unpickled TopologyAtoms and TopologyBonds are those of the unpickled Topology"""
+        import pickle
+
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+
+        topology_atoms = list(topology.topology_atoms)
+        topology_bonds = list(topology.topology_bonds)
+        new_topology, new_atoms, new_bonds = pickle.loads(
+            pickle.dumps((topology, topology_atoms, topology_bonds))
+        )
+        for index, topology_atom in enumerate(new_atoms):
+            assert topology_atom is new_topology.atom(index)
+        for index, topology_bond in enumerate(new_bonds):
+            assert topology_bond is new_topology.bond(index)
+
+    def test_topology_atom_topology_bonds(self):
+        """Test that TopologyAtom.topology_bonds follows the reference atom's bonds"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles)
+
+        for topology_atom in topology.topology_atoms:
+            topology_bonds = list(topology_atom.topology_bonds)
+            assert [top_bond.bond for top_bond in topology_bonds] == list(
+                topology_atom.atom.bonds
+            )
+            for top_bond in topology_bonds:
+                assert top_bond.topology_molecule is topology_atom.topology_molecule
+                assert topology_atom in top_bond.atoms
+
+    def test_topology_atom_bond_hashing(self):
+        """Test that TopologyAtoms and TopologyBonds can be used as dictionary keys"""
+        topology = Topology()
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.ethane_from_smiles)
+
+        atom_indices = {
+            topology_atom: topology_atom.topology_atom_index
+            for topology_atom in topology.topology_atoms
+        }
+        assert len(atom_indices) == topology.n_topology_atoms
+        for index in range(topology.n_topology_atoms):
+            assert atom_indices[topology.atom(index)] == index
+        # Identical reference atoms in different TopologyMolecules are distinct
+        assert topology.atom(0) != topology.atom(8)
+        assert topology.atom(0) != topology.atom(0).atom
+
+        bonds = set(topology.topology_bonds)
+        assert len(bonds) == topology.n_topology_bonds
+        assert topology.bond(7) in bonds
+
     def test_topology_atom_element(self):
         """Test getters of TopologyAtom element and atomic number"""
         topology = Topology()
@@ -435,6 +751,82 @@ class TestTopology(TestCase):
         assert topology.virtual_site(0).topology_virtual_particle_start_index == 11
         assert topology.virtual_site(1).topology_virtual_particle_start_index == 13
 
+    def test_virtual_start_indices_after_adding_virtual_sites(self):
+        """Test that virtual site start indices follow virtual sites added to reference molecules"""
+        topology = Topology()
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        topology.add_molecule(self.ethane_from_smiles)
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        propane, ethane = topology.reference_molecules
+        n_propane_vsites = propane.n_virtual_sites
+        n_propane_particles = sum(vsite.n_particles for vsite in propane.virtual_sites)
+
+        topology_molecules = topology.topology_molecules
+        assert topology_molecules[1].virtual_site_start_topology_index == (
+            n_propane_vsites
+        )
+        assert topology_molecules[2].virtual_site_start_topology_index == (
+            n_propane_vsites
+        )
+        # Populate any cached indices before the new virtual site shifts them
+        for particle in topology.topology_particles:
+            particle.topology_particle_index
+
+        ethane._add_bond_charge_virtual_site(
+            [ethane.atoms[0], ethane.atoms[1]], 0.5 * unit.angstrom
+        )
+        n_ethane_particles = ethane.virtual_sites[0].n_particles
+        assert topology_molecules[2].virtual_site_start_topology_index == (
+            n_propane_vsites + 1
+        )
+        assert topology_molecules[2].virtual_particle_start_topology_index == (
+            topology.n_topology_atoms + n_propane_particles + n_ethane_particles
+        )
+        topology_particles = list(topology.topology_particles)
+        assert len(topology_particles) == topology.n_topology_particles
+        for index, particle in enumerate(topology_particles):
+            assert particle.topology_particle_index == index
+
+    def test_topology_virtual_sites_are_reused(self):
+        """Test that TopologyVirtualSites are reused until the reference virtual sites change"""
+        topology = Topology()
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        topology_molecule = topology.topology_molecules[0]
+
+        tvsites = list(topology_molecule.virtual_sites)
+        assert len(tvsites) == topology_molecule.n_virtual_sites
+        for index, tvsite in enumerate(topology_molecule.virtual_sites):
+            assert tvsite is tvsites[index]
+            assert topology_molecule.virtual_site(index) is tvsite
+
+        reference_molecule = topology_molecule.reference_molecule
+        reference_molecule._add_bond_charge_virtual_site(
+            [reference_molecule.atoms[0], reference_molecule.atoms[1]],
+            0.5 * unit.angstrom,
+            name="extra",
+        )
+        new_tvsites = list(topology_molecule.virtual_sites)
+        assert len(new_tvsites) == len(tvsites) + 1
+        assert new_tvsites[-1].virtual_site is reference_molecule.virtual_sites[-1]
+
+    def test_topology_molecule_particle(self):
+        """Test that TopologyMolecule.particle follows the order of its particles"""
+        topology = Topology()
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        topology_molecule = topology.topology_molecules[0]
+
+        particles = list(topology_molecule.particles)
+        assert len(particles) == topology_molecule.n_particles
+        for index, particle in enumerate(particles):
+            assert topology_molecule.particle(index) == particle
+            assert (
+                topology_molecule.particle(index).topology_particle_index
+                == particle.topology_particle_index
+            )
+        assert topology_molecule.particle(-1) == particles[-1]
+        with pytest.raises(IndexError):
+            topology_molecule.particle(len(particles))
+
     def test_topology_virtual_site_n_particles(self):
         """
         Test if the virtual sites report the correct number of particles
@@ -477,6 +869,7 @@ class TestTopology(TestCase):
             )
             assert top_vs.atom(0).topology_particle_index == expected_indices[0]
             assert top_vs.atom(1).topology_particle_index == expected_indices[1]
+            assert top_vs.topology_atom_indices.tolist() == list(expected_indices)
 
     def test_is_bonded(self):
         """Test Topology.virtual_site function (get virtual site from index)"""
@@ -489,6 +882,26 @@ class TestTopology(TestCase):
         topology.assert_bonded(0, 4)
         with self.assertRaises(Exception) as context:
             topology.assert_bonded(0, 2)
+        # NumPy integer indices are accepted too
+        topology.assert_bonded(np.int64(0), np.int32(1))
+        assert topology.is_bonded(np.int64(1), np.int64(2))
+        assert not topology.is_bonded(np.int64(0), np.int64(2))
+
+        # Atoms of different molecules are never bonded, and reordered copies are
+        # bonded by their own atom order
+        n_atoms = self.propane_from_smiles_w_vsites.n_atoms
+        topology.add_molecule(
+            self.propane_from_smiles_w_vsites,
+            local_topology_to_reference_index={
+                i: n_atoms - 1 - i for i in range(n_atoms)
+            },
+        )
+        for topology_bond in topology.topology_bonds:
+            atom1, atom2 = topology_bond.atoms
+            index1, index2 = atom1.topology_atom_index, atom2.topology_atom_index
+            assert topology.is_bonded(index1, index2)
+            assert topology.is_bonded(atom2, atom1)
+        assert not topology.is_bonded(1, n_atoms + 1)
 
     def test_angles(self):
         """Topology.angles should return image angles of all topology molecules."""
@@ -998,6 +1411,43 @@ class TestTopology(TestCase):
                 pdbfile.topology, unique_molecules=molecules
             )
 
+    def test_from_openmm_repeated_molecules(self):
+        """Test that repeated copies of molecules keep the OpenMM atoms and bonds"""
+        from simtk.openmm import app
+
+        pdbfile = app.PDBFile(
+            get_data_file_path("systems/packmol_boxes/cyclohexane_ethanol_0.4_0.6.pdb")
+        )
+        molecules = [Molecule.from_smiles(smiles) for smiles in ("CCO", "C1CCCCC1")]
+        topology = Topology.from_openmm(pdbfile.topology, unique_molecules=molecules)
+
+        omm_atoms = list(pdbfile.topology.atoms())
+        assert topology.n_topology_atoms == len(omm_atoms)
+        for topology_atom, omm_atom in zip(topology.topology_atoms, omm_atoms):
+            assert topology_atom.atomic_number == omm_atom.element.atomic_number
+        omm_bonds = {
+            tuple(sorted((bond.atom1.index, bond.atom2.index)))
+            for bond in pdbfile.topology.bonds()
+        }
+        topology_bonds = {
+            tuple(sorted(atom.topology_atom_index for atom in topology_bond.atoms))
+            for topology_bond in topology.topology_bonds
+        }
+        assert topology_bonds == omm_bonds
+
+    def test_from_openmm_duplicate_unique_mol_from_smiles(self):
+        """Check that indistinguishable unique mols with different atom orders are rejected"""
+        from simtk.openmm import app
+
+        pdbfile = app.PDBFile(
+            get_data_file_path("systems/packmol_boxes/cyclohexane_ethanol_0.4_0.6.pdb")
+        )
+        molecules = [
+            Molecule.from_smiles(smiles) for smiles in ("CCO", "OCC", "C1CCCCC1")
+        ]
+        with self.assertRaises(DuplicateUniqueMoleculeError):
+            Topology.from_openmm(pdbfile.topology, unique_molecules=molecules)
+
     @pytest.mark.skip
     def test_from_openmm_distinguish_using_stereochemistry(self):
         """Test creation of an OpenFF Topology object from an OpenMM topology with stereoisomers"""
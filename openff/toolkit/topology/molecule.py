@@ -33,6 +33,7 @@ Molecular chemical entity representation and routines to interface with cheminfo
 # GLOBAL IMPORTS
 # =============================================================================================
 
+import itertools
 import operator
 import warnings
 from collections import OrderedDict
@@ -97,6 +98,8 @@ class Particle(Serializable):
     .. warning :: This API is experimental and subject to change.
     """
 
+    __slots__ = ("_molecule", "_name")
+
     @property
     def molecule(self):
         """
@@ -170,6 +173,16 @@ class Atom(Particle):
     .. warning :: This API is experimental and subject to change.
     """
 
+    __slots__ = (
+        "_atomic_number",
+        "_formal_charge",
+        "_is_aromatic",
+        "_stereochemistry",
+        "_bonds",
+        "_virtual_sites",
+        "_molecule_atom_index",
+    )
+
     def __init__(
         self,
         atomic_number,
@@ -222,8 +235,8 @@ class Atom(Particle):
             name = ""
         self._name = name
         self._molecule = molecule
-        ## From Jeff: I'm going to assume that this is implicit in the parent Molecule's ordering of atoms
-        # self._molecule_atom_index = molecule_atom_index
+        # The index of this atom in the parent Molecule's ordering of atoms is cached on first use
+        self._molecule_atom_index = None
         self._bonds = list()
         self._virtual_sites = list()
 
@@ -471,7 +484,13 @@ class Atom(Particle):
         """
         if self._molecule is None:
             raise ValueError("This Atom does not belong to a Molecule object")
-        return self._molecule.atoms.index(self)
+        # Avoid an O(N) list.index() scan when the cached index is still valid
+        atoms = self._molecule.atoms
+        index = self._molecule_atom_index
+        if index is None or index >= len(atoms) or atoms[index] is not self:
+            index = atoms.index(self)
+            self._molecule_atom_index = index
+        return index
 
     @property
     def molecule_particle_index(self):
@@ -482,7 +501,8 @@ class Atom(Particle):
         """
         if self._molecule is None:
             raise ValueError("This Atom does not belong to a Molecule object")
-        return self._molecule.particles.index(self)
+        # Particles are ordered with all atoms first, followed by virtual particles
+        return self.molecule_atom_index
 
     # ## From Jeff: Not sure if we actually need this
     # @property
@@ -521,6 +541,8 @@ class VirtualParticle(Particle):
     .. warning :: This API is experimental and subject to change.
     """
 
+    __slots__ = ("_virtual_site", "_orientation")
+
     def __init__(self, vsite, orientation, name=None):
         """
         A single particle owned by a VirtualSite
@@ -556,6 +578,25 @@ class VirtualParticle(Particle):
         """
         return self.virtual_site.orientations.index(self.orientation)
 
+    @property
+    def molecule_particle_index(self):
+        """
+        Returns the index of this particle in its molecule
+        """
+        # Particles are ordered with all atoms first, followed by the particles of each
+        # virtual site in turn, so this avoids building and scanning the particle list
+        vsite_index = self._virtual_site.molecule_virtual_site_index
+        n_preceding_particles = sum(
+            len(vsite._particles)
+            for vsite in self._molecule.virtual_sites[:vsite_index]
+        )
+        particle_orientations = list(self._virtual_site._particles)
+        return (
+            self._molecule.n_atoms
+            + n_preceding_particles
+            + particle_orientations.index(self._orientation)
+        )
+
 
 # =============================================================================================
 # VirtualSite
@@ -695,7 +736,12 @@ class VirtualSite(Particle):
         for atom in atoms:
             atom.add_virtual_site(self)
             self._atoms.append(atom)
+        # Molecule atom indices of the atoms, for gathering per-atom data in one indexing operation
+        self._atom_indices = np.array(
+            [atom.molecule_atom_index for atom in self._atoms], dtype=np.int32
+        )
         self._molecule = atoms[0].molecule
+        self._molecule_virtual_site_index = None
 
         self._name = name
 
@@ -739,7 +785,7 @@ class VirtualSite(Particle):
         # Each subclass should have its own to_dict
         vsite_dict = OrderedDict()
         vsite_dict["name"] = self._name
-        vsite_dict["atoms"] = tuple([i.molecule_atom_index for i in self.atoms])
+        vsite_dict["atoms"] = tuple(self._atom_indices.tolist())
         vsite_dict["charge_increments"] = quantity_to_string(self._charge_increments)
 
         vsite_dict["epsilon"] = quantity_to_string(self._epsilon)
@@ -787,8 +833,7 @@ class VirtualSite(Particle):
         """
         Particles owned by this VirtualSite
         """
-        for vp in self._particles.values():
-            yield vp
+        return iter(self._particles.values())
 
     @property
     def n_particles(self):
@@ -809,9 +854,16 @@ class VirtualSite(Particle):
         """
         # if self._topology is None:
         #    raise ValueError('This VirtualSite does not belong to a Topology object')
-        # TODO: This will be slow; can we cache this and update it only when needed?
-        #       Deleting atoms/molecules in the Topology would have to invalidate the cached index.
-        return self._molecule.virtual_sites.index(self)
+        virtual_sites = self._molecule.virtual_sites
+        index = self._molecule_virtual_site_index
+        if (
+            index is None
+            or index >= len(virtual_sites)
+            or virtual_sites[index] is not self
+        ):
+            index = virtual_sites.index(self)
+            self._molecule_virtual_site_index = index
+        return index
 
     # @property
     # def molecule_particle_index(self):
@@ -1528,6 +1580,17 @@ class Bond(Serializable):
     .. warning :: This API is experimental and subject to change.
     """
 
+    __slots__ = (
+        "_molecule",
+        "_molecule_bond_index",
+        "_atom1",
+        "_atom2",
+        "_fractional_bond_order",
+        "_bond_order",
+        "_is_aromatic",
+        "_stereochemistry",
+    )
+
     def __init__(
         self,
         atom1,
@@ -1546,6 +1609,7 @@ class Bond(Serializable):
         assert atom1.molecule is atom2.molecule
         assert isinstance(atom1.molecule, FrozenMolecule)
         self._molecule = atom1.molecule
+        self._molecule_bond_index = None
 
         self._atom1 = atom1
         self._atom2 = atom2
@@ -1593,11 +1657,11 @@ class Bond(Serializable):
 
     @property
     def atom1_index(self):
-        return self.molecule.atoms.index(self._atom1)
+        return self._atom1.molecule_atom_index
 
     @property
     def atom2_index(self):
-        return self.molecule.atoms.index(self._atom2)
+        return self._atom2.molecule_atom_index
 
     @property
     def atoms(self):
@@ -1647,7 +1711,12 @@ class Bond(Serializable):
         """
         if self._molecule is None:
             raise ValueError("This Atom does not belong to a Molecule object")
-        return self._molecule.bonds.index(self)
+        bonds = self._molecule.bonds
+        index = self._molecule_bond_index
+        if index is None or index >= len(bonds) or bonds[index] is not self:
+            index = bonds.index(self)
+            self._molecule_bond_index = index
+        return index
 
     @property
     def is_in_ring(self):
@@ -2213,6 +2282,10 @@ class FrozenMolecule(Serializable):
         # not have any references to the old molecule
         other_dict = deepcopy(other.to_dict())
         self._initialize_from_dict(other_dict)
+        # The copy is chemically identical, with the same atom order and properties, so
+        # any SMILES already generated for the original also hold for the copy
+        if other._cached_smiles is not None:
+            self._cached_smiles = dict(other._cached_smiles)
 
     def __eq__(self, other):
         """Test two molecules for equality to see if they are the chemical species, but do not check other annotated properties.
@@ -3033,6 +3106,9 @@ class FrozenMolecule(Serializable):
         self._impropers = None
 
         self._cached_smiles = None
+        self._cached_bond_graph_csr = None
+        self._cached_atomic_numbers_array = None
+        self._cached_bond_atom_indices = None
         # TODO: Clear fractional bond orders
         self._rings = None
 
@@ -3214,10 +3290,11 @@ class FrozenMolecule(Serializable):
             name=name,
             molecule=self,
         )
+        atom._molecule_atom_index = len(self._atoms)
         self._atoms.append(atom)
         # self._particles.append(atom)
         self._invalidate_cached_properties()
-        return self._atoms.index(atom)
+        return atom._molecule_atom_index
 
     def _add_virtual_site(self, vsite, replace=False):
         replaced = False
@@ -3226,6 +3303,7 @@ class FrozenMolecule(Serializable):
             if same_vsite:
                 if replace:
                     self._virtual_sites[i] = vsite
+                    vsite._molecule_virtual_site_index = i
                     replaced = True
                     break
                 else:
@@ -3237,8 +3315,9 @@ class FrozenMolecule(Serializable):
                     ).format(vsite, self, existing_vsite)
                     raise Exception(error_msg)
         if not replaced:
+            vsite._molecule_virtual_site_index = len(self._virtual_sites)
             self._virtual_sites.append(vsite)
-        return self._virtual_sites.index(vsite)
+        return vsite._molecule_virtual_site_index
 
     def _add_bond_charge_virtual_site(self, atoms, distance, **kwargs):
         """
@@ -3278,9 +3357,9 @@ class FrozenMolecule(Serializable):
 
         vsite = BondChargeVirtualSite(atoms, distance, **kwargs)
 
-        self._add_virtual_site(vsite, replace=replace)
+        index = self._add_virtual_site(vsite, replace=replace)
         self._invalidate_cached_properties()
-        return self._virtual_sites.index(vsite)
+        return index
 
     def _add_monovalent_lone_pair_virtual_site(
         self, atoms, distance, out_of_plane_angle, in_plane_angle, **kwargs
@@ -3323,9 +3402,9 @@ class FrozenMolecule(Serializable):
             atoms, distance, out_of_plane_angle, in_plane_angle, **kwargs
         )
 
-        self._add_virtual_site(vsite, replace=replace)
+        index = self._add_virtual_site(vsite, replace=replace)
         self._invalidate_cached_properties()
-        return self._virtual_sites.index(vsite)
+        return index
 
     def _add_divalent_lone_pair_virtual_site(
         self, atoms, distance, out_of_plane_angle, **kwargs
@@ -3368,9 +3447,9 @@ class FrozenMolecule(Serializable):
             atoms, distance, out_of_plane_angle, **kwargs
         )
 
-        self._add_virtual_site(vsite, replace=replace)
+        index = self._add_virtual_site(vsite, replace=replace)
         self._invalidate_cached_properties()
-        return self._virtual_sites.index(vsite)
+        return index
 
     def _add_trivalent_lone_pair_virtual_site(self, atoms, distance, **kwargs):
         """
@@ -3401,9 +3480,9 @@ class FrozenMolecule(Serializable):
 
         vsite = TrivalentLonePairVirtualSite(atoms, distance, **kwargs)
 
-        self._add_virtual_site(vsite, replace=replace)
+        index = self._add_virtual_site(vsite, replace=replace)
         self._invalidate_cached_properties()
-        return self._virtual_sites.index(vsite)
+        return index
 
     def _add_bond(
         self,
@@ -3463,10 +3542,10 @@ class FrozenMolecule(Serializable):
             stereochemistry=stereochemistry,
             fractional_bond_order=fractional_bond_order,
         )
+        bond._molecule_bond_index = len(self._bonds)
         self._bonds.append(bond)
         self._invalidate_cached_properties()
-        # TODO: This is a bad way to get bond index
-        return self._bonds.index(bond)
+        return bond._molecule_bond_index
 
     def _add_conformer(self, coordinates):
         """
@@ -3483,24 +3562,26 @@ class FrozenMolecule(Serializable):
         index: int
             The index of this conformer
         """
-        new_conf = unit.Quantity(
-            np.zeros(shape=(self.n_atoms, 3), dtype=float), unit.angstrom
-        )
-        if not (new_conf.shape == coordinates.shape):
+        expected_shape = (self.n_atoms, 3)
+        if not (expected_shape == coordinates.shape):
             raise Exception(
                 "molecule.add_conformer given input of the wrong shape: "
-                "Given {}, expected {}".format(coordinates.shape, new_conf.shape)
+                "Given {}, expected {}".format(coordinates.shape, expected_shape)
             )
 
-        try:
-            new_conf[:] = coordinates
-        except AttributeError as e:
-            print(e)
+        if not unit.is_quantity(coordinates):
             raise Exception(
                 "Coordinates passed to Molecule._add_conformer without units. Ensure that coordinates are "
                 "of type simtk.units.Quantity"
             )
 
+        # Convert the whole array at once; element-wise assignment into a Quantity is very slow.
+        # np.array always copies, so the conformer does not share memory with the input.
+        new_conf = unit.Quantity(
+            np.array(coordinates.value_in_unit(unit.angstrom), dtype=float),
+            unit.angstrom,
+        )
+
         if self._conformers is None:
             # TODO should we checking that the exact same conformer is not in the list already?
             self._conformers = []
@@ -5158,18 +5239,25 @@ class FrozenMolecule(Serializable):
         """
         # TODO: Build Angle objects instead of tuple of atoms.
         if not hasattr(self, "_angles"):
-            self._construct_bonded_atoms_list()
-            self._angles = set()
-            for atom1 in self._atoms:
-                for atom2 in self._bondedAtoms[atom1]:
-                    for atom3 in self._bondedAtoms[atom2]:
-                        if atom1 == atom3:
-                            continue
-                        # TODO: Encapsulate this logic into an Angle class.
-                        if atom1.molecule_atom_index < atom3.molecule_atom_index:
-                            self._angles.add((atom1, atom2, atom3))
-                        else:
-                            self._angles.add((atom3, atom2, atom1))
+            row_ptr, col_idx, _ = self._bond_graph_csr
+            # Pair each directed bond center-left with every bond center-right
+            # that follows it in the center's neighbor list
+            n_neighbors = np.diff(row_ptr)
+            centers = np.repeat(np.arange(self.n_atoms, dtype=np.int32), n_neighbors)
+            n_pairs = row_ptr[centers + 1] - np.arange(len(col_idx)) - 1
+            left = np.repeat(np.arange(len(col_idx)), n_pairs)
+            group_starts = np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+            right = left + np.arange(len(left)) - group_starts + 1
+            # Order each angle so that the first atom index is less than the last
+            # TODO: Encapsulate this logic into an Angle class.
+            ends = np.sort(np.stack([col_idx[left], col_idx[right]], axis=1), axis=1)
+            atoms = self._atoms
+            self._angles = {
+                (atoms[i], atoms[j], atoms[k])
+                for i, j, k in zip(
+                    ends[:, 0].tolist(), centers[left].tolist(), ends[:, 1].tolist()
+                )
+            }
 
     def _construct_torsions(self):
         """
@@ -5178,39 +5266,125 @@ class FrozenMolecule(Serializable):
         # TODO: Build Proper/ImproperTorsion objects instead of tuple of atoms.
         if not hasattr(self, "_torsions"):
             self._construct_bonded_atoms_list()
+            atoms = self._atoms
+
+            # Join every directed bond 2-3 with the neighbors 1 of atom 2 and 4 of atom 3
+            row_ptr, col_idx, _ = self._bond_graph_csr
+            n_neighbors = np.diff(row_ptr)
+            atom2s = np.repeat(np.arange(self.n_atoms, dtype=np.int32), n_neighbors)
+            atom3s = col_idx
+            n_combinations = n_neighbors[atom2s] * n_neighbors[atom3s]
+            bond_idx = np.repeat(np.arange(len(col_idx)), n_combinations)
+            local_idx = np.arange(len(bond_idx)) - np.repeat(
+                np.cumsum(n_combinations) - n_combinations, n_combinations
+            )
+            n_atom4s = n_neighbors[atom3s[bond_idx]]
+            atom2s = atom2s[bond_idx]
+            atom3s = atom3s[bond_idx]
+            atom1s = col_idx[row_ptr[atom2s] + local_idx // n_atom4s]
+            atom4s = col_idx[row_ptr[atom3s] + local_idx % n_atom4s]
+            # Exclude 1-2-1 and 2-3-2 backtracking, and i-j-k-i
+            keep = (atom1s != atom3s) & (atom4s != atom2s) & (atom1s != atom4s)
+            torsions = np.stack([atom1s, atom2s, atom3s, atom4s], axis=1)[keep]
+            # Each torsion is found once in each direction; keep the one with 1 < 4
+            torsions = torsions[torsions[:, 0] < torsions[:, 3]]
+            self._propers = {
+                (atoms[i], atoms[j], atoms[k], atoms[l])
+                for i, j, k, l in torsions.tolist()
+            }
 
-            self._propers = set()
             self._impropers = set()
-            for atom1 in self._atoms:
-                for atom2 in self._bondedAtoms[atom1]:
-                    for atom3 in self._bondedAtoms[atom2]:
-                        if atom1 == atom3:
-                            continue
-                        for atom4 in self._bondedAtoms[atom3]:
-                            if atom4 == atom2:
-                                continue
-                            # Exclude i-j-k-i
-                            if atom1 == atom4:
-                                continue
-
-                            if atom1.molecule_atom_index < atom4.molecule_atom_index:
-                                torsion = (atom1, atom2, atom3, atom4)
-                            else:
-                                torsion = (atom4, atom3, atom2, atom1)
-
-                            self._propers.add(torsion)
-
-                        for atom3i in self._bondedAtoms[atom2]:
-                            if atom3i == atom3:
-                                continue
-                            if atom3i == atom1:
-                                continue
-
-                            improper = (atom1, atom2, atom3, atom3i)
-                            self._impropers.add(improper)
+            for atom2 in atoms:
+                for atom1, atom3, atom3i in itertools.permutations(
+                    self._bondedAtoms[atom2], 3
+                ):
+                    improper = (atom1, atom2, atom3, atom3i)
+                    self._impropers.add(improper)
 
             self._torsions = self._propers | self._impropers
 
+    def _build_csr(self):
+        """
+        Build a compressed sparse row representation of the bond graph.
+
+        The neighbors of atom ``i`` are ``col_idx[row_ptr[i]:row_ptr[i + 1]]``, and the
+        bonds to them are ``bond_idx[row_ptr[i]:row_ptr[i + 1]]``. These are in the same
+        order as ``Atom.bonds``, which is the order in which the bonds were added.
+
+        Returns
+        -------
+        row_ptr : numpy.ndarray of int32 of shape (n_atoms + 1,)
+            The start of each atom's neighbors in ``col_idx``
+        col_idx : numpy.ndarray of int32 of shape (2 * n_bonds,)
+            The molecule atom indices of the neighbors of each atom
+        bond_idx : numpy.ndarray of int32 of shape (2 * n_bonds,)
+            The molecule bond indices of the bonds to the neighbors of each atom
+        """
+        n_bonds = len(self._bonds)
+        bonded_pairs = self._bond_atom_indices
+        # Store each bond in both directions, grouped by the first atom and then in bond order
+        sources = np.concatenate([bonded_pairs[:, 0], bonded_pairs[:, 1]])
+        targets = np.concatenate([bonded_pairs[:, 1], bonded_pairs[:, 0]])
+        bond_idx = np.tile(np.arange(n_bonds, dtype=np.int32), 2)
+        order = np.lexsort((bond_idx, sources))
+        row_ptr = np.zeros(self.n_atoms + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=self.n_atoms), out=row_ptr[1:])
+        return row_ptr, targets[order], bond_idx[order]
+
+    @property
+    def _bond_graph_csr(self):
+        """
+        The compressed sparse row representation of the bond graph, built on first use.
+
+        See Also
+        --------
+        _build_csr
+        """
+        if getattr(self, "_cached_bond_graph_csr", None) is None:
+            self._cached_bond_graph_csr = self._build_csr()
+        return self._cached_bond_graph_csr
+
+    @property
+    def _atomic_numbers_array(self):
+        """
+        A read-only array of the atomic numbers of this molecule's atoms, built on first use.
+
+        Returns
+        -------
+        atomic_numbers : numpy.ndarray of int8 of shape (n_atoms,)
+        """
+        if getattr(self, "_cached_atomic_numbers_array", None) is None:
+            atomic_numbers = np.fromiter(
+                (atom.atomic_number for atom in self._atoms),
+                dtype=np.int8,
+                count=self.n_atoms,
+            )
+            atomic_numbers.setflags(write=False)
+            self._cached_atomic_numbers_array = atomic_numbers
+        return self._cached_atomic_numbers_array
+
+    @property
+    def _bond_atom_indices(self):
+        """
+        A read-only array of the molecule atom indices of each bond, built on first use.
+
+        Returns
+        -------
+        bond_atom_indices : numpy.ndarray of int32 of shape (n_bonds, 2)
+            The indices of ``atom1`` and ``atom2`` of each bond, in bond order
+        """
+        if getattr(self, "_cached_bond_atom_indices", None) is None:
+            bond_atom_indices = np.array(
+                [
+                    (bond.atom1.molecule_atom_index, bond.atom2.molecule_atom_index)
+                    for bond in self._bonds
+                ],
+                dtype=np.int32,
+            ).reshape(-1, 2)
+            bond_atom_indices.setflags(write=False)
+            self._cached_bond_atom_indices = bond_atom_indices
+        return self._cached_bond_atom_indices
+
     def _construct_bonded_atoms_list(self):
         """
         Construct list of all atoms each atom is bonded to.
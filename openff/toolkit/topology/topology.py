@@ -22,7 +22,8 @@ Class definitions to represent a molecular system and its chemical components
 # =============================================================================================
 
 import itertools
-from collections import OrderedDict
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
 from collections.abc import MutableMapping
 
 import numpy as np
@@ -83,6 +84,56 @@ class MissingUniqueMoleculesError(MessageException):
 # PRIVATE SUBROUTINES
 # =============================================================================================
 
+# Names of the standard protein, DNA and RNA residues, as used by oeommtools. Atoms in
+# any other residue are flagged as heteroatoms by Topology._to_openeye
+_BIOPOLYMER_RESIDUE_NAMES = frozenset(
+    [
+        # Protein
+        "ALA",
+        "ASN",
+        "CYS",
+        "GLU",
+        "HIS",
+        "LEU",
+        "MET",
+        "PRO",
+        "THR",
+        "TYR",
+        "ARG",
+        "ASP",
+        "GLN",
+        "GLY",
+        "ILE",
+        "LYS",
+        "PHE",
+        "SER",
+        "TRP",
+        "VAL",
+        # DNA
+        "DA",
+        "DG",
+        "DC",
+        "DT",
+        "DI",
+        # RNA
+        "A",
+        "G",
+        "C",
+        "U",
+        "I",
+    ]
+)
+
+
+def _topology_atom_from_index(topology_molecule, molecule_atom_index):
+    """Look up the cached TopologyAtom of a reference atom, used to unpickle TopologyAtoms"""
+    return topology_molecule._topology_atoms[molecule_atom_index]
+
+
+def _topology_bond_from_index(topology_molecule, molecule_bond_index):
+    """Look up the cached TopologyBond of a reference bond, used to unpickle TopologyBonds"""
+    return topology_molecule._topology_bonds[molecule_bond_index]
+
 
 class _TransformedDict(MutableMapping):
     """A dictionary that transform and sort keys.
@@ -93,11 +144,18 @@ class _TransformedDict(MutableMapping):
     The function __sortfunc__ can be inherited to specify a particular
     order over which to iterate over the dictionary.
 
+    Subclasses overriding __keytransform__ should also override
+    key_transform_array with an equivalent vectorized transform, which
+    is used by from_array to build the dictionary in bulk.
+
     """
 
+    __slots__ = ("store",)
+
     def __init__(self, *args, **kwargs):
-        self.store = OrderedDict()
-        self.update(dict(*args, **kwargs))  # use the free update to set keys
+        # Plain dicts preserve insertion order, and iteration order is set by __sortfunc__ anyway
+        self.store = dict()
+        self.update(*args, **kwargs)  # use the free update to set keys
 
     def __getitem__(self, key):
         return self.store[self.__keytransform__(key)]
@@ -108,6 +166,10 @@ class _TransformedDict(MutableMapping):
     def __delitem__(self, key):
         del self.store[self.__keytransform__(key)]
 
+    def __contains__(self, key):
+        # Avoid the try/except __getitem__ round trip of the Mapping mixin
+        return self.__keytransform__(key) in self.store
+
     def __iter__(self):
         return iter(sorted(self.store, key=self.__sortfunc__))
 
@@ -121,11 +183,47 @@ class _TransformedDict(MutableMapping):
     def __sortfunc__(key):
         return key
 
+    @staticmethod
+    def key_transform_array(keys):
+        """Apply the key transform to every row of a 2D array of keys."""
+        return keys
+
+    @classmethod
+    def from_array(cls, keys, values):
+        """
+        Create a dictionary from an array of keys, transforming all keys at once.
+
+        This avoids a Python-level key transform for each item, and is preferable
+        to repeated item assignment when inserting many keys.
+
+        Parameters
+        ----------
+        keys : array-like of int of shape (n_keys, key_length)
+            The untransformed keys
+        values : iterable of length n_keys
+            The value corresponding to each key
+
+        Returns
+        -------
+        transformed_dict : _TransformedDict
+            A dictionary of the calling subclass
+        """
+        transformed_dict = cls()
+        keys = np.asarray(keys)
+        if len(keys) == 0:
+            return transformed_dict
+        keys = cls.key_transform_array(keys)
+        # Use tolist() so that keys are tuples of Python ints rather than NumPy scalars
+        transformed_dict.store.update(zip(map(tuple, keys.tolist()), values))
+        return transformed_dict
+
 
 # TODO: Encapsulate this atom ordering logic directly into Atom/Bond/Angle/Torsion classes?
 class ValenceDict(_TransformedDict):
     """Enforce uniqueness in atom indices."""
 
+    __slots__ = ()
+
     @staticmethod
     def key_transform(key):
         """Reverse tuple if first element is larger than last element."""
@@ -133,9 +231,11 @@ class ValenceDict(_TransformedDict):
         key = tuple(key)
         assert len(key) > 0 and len(key) < 5, "Valence keys must be at most 4 atoms"
         # Reverse the key if the first element is bigger than the last.
-        if key[0] > key[-1]:
-            key = tuple(reversed(key))
-        return key
+        if key[0] <= key[-1]:
+            return key
+        if len(key) == 2:
+            return (key[1], key[0])
+        return key[::-1]
 
     @staticmethod
     def index_of(key, possible=None):
@@ -199,6 +299,16 @@ class ValenceDict(_TransformedDict):
             # If the possible permutations were NOT provided, then return the unique index of this permutation.
             return permutations[key]
 
+    @staticmethod
+    def key_transform_array(keys):
+        """Reverse each row of a 2D array of keys if its first element is larger than its last element."""
+        assert keys.ndim == 2, "Valence keys must be a 2D array"
+        assert 0 < keys.shape[1] < 5, "Valence keys must be at most 4 atoms"
+        keys = np.array(keys)
+        reverse = keys[:, 0] > keys[:, -1]
+        keys[reverse] = keys[reverse, ::-1]
+        return keys
+
     def __keytransform__(self, key):
         return __class__.key_transform(key)
 
@@ -206,6 +316,8 @@ class ValenceDict(_TransformedDict):
 class SortedDict(_TransformedDict):
     """Enforce uniqueness of atom index tuples, without any restrictions on atom reordering."""
 
+    __slots__ = ()
+
     def __keytransform__(self, key):
         """Sort tuple from lowest to highest."""
         # Ensure key is a tuple.
@@ -213,10 +325,17 @@ class SortedDict(_TransformedDict):
         # Reverse the key if the first element is bigger than the last.
         return key
 
+    @staticmethod
+    def key_transform_array(keys):
+        """Sort each row of a 2D array of keys from lowest to highest."""
+        return np.sort(keys, axis=1)
+
 
 class ImproperDict(_TransformedDict):
     """Symmetrize improper torsions."""
 
+    __slots__ = ()
+
     @staticmethod
     def key_transform(key):
         """Reorder tuple in numerical order except for element[1] which is the central atom; it retains its position."""
@@ -224,12 +343,17 @@ class ImproperDict(_TransformedDict):
         key = tuple(key)
         assert len(key) == 4, "Improper keys must be 4 atoms"
         # Retrieve connected atoms
-        connectedatoms = [key[0], key[2], key[3]]
-        # Sort connected atoms
-        connectedatoms.sort()
+        atom1, atom3, atom4 = key[0], key[2], key[3]
+        # Sort connected atoms with a three-element sorting network, which avoids
+        # building and sorting a temporary list
+        if atom1 > atom3:
+            atom1, atom3 = atom3, atom1
+        if atom3 > atom4:
+            atom3, atom4 = atom4, atom3
+        if atom1 > atom3:
+            atom1, atom3 = atom3, atom1
         # Re-store connected atoms
-        key = tuple([connectedatoms[0], key[1], connectedatoms[1], connectedatoms[2]])
-        return key
+        return (atom1, key[1], atom3, atom4)
 
     @staticmethod
     def index_of(key, possible=None):
@@ -279,6 +403,15 @@ class ImproperDict(_TransformedDict):
         else:
             return permutations[key]
 
+    @staticmethod
+    def key_transform_array(keys):
+        """Sort the connected atoms of each row of a 2D array of keys, keeping the central atom in position 1."""
+        assert keys.ndim == 2 and keys.shape[1] == 4, "Improper keys must be 4 atoms"
+        keys = np.array(keys)
+        connected_atoms = [0, 2, 3]
+        keys[:, connected_atoms] = np.sort(keys[:, connected_atoms], axis=1)
+        return keys
+
     def __keytransform__(self, key):
         return __class__.key_transform(key)
 
@@ -301,12 +434,14 @@ class TopologyAtom(Serializable):
     the parent Topology's TopologyMolecule list.
 
     As some systems can be very large, there is no always-existing representation of a TopologyAtom. They are created on
-    demand as the user requests them.
+    demand as the user requests them, and then reused by their TopologyMolecule.
 
     .. warning :: This API is experimental and subject to change.
 
     """
 
+    __slots__ = ("_atom", "_topology_molecule")
+
     def __init__(self, atom, topology_molecule):
         """
         Create a new TopologyAtom.
@@ -387,12 +522,10 @@ class TopologyAtom(Serializable):
         int
             The index of this atom in its parent topology.
         """
-        mapped_molecule_atom_index = self._topology_molecule._ref_to_top_index[
-            self._atom.molecule_atom_index
-        ]
-        return (
-            self._topology_molecule.atom_start_topology_index
-            + mapped_molecule_atom_index
+        return int(
+            self._topology_molecule._atom_topology_indices[
+                self._atom.molecule_atom_index
+            ]
         )
 
     @property
@@ -419,13 +552,30 @@ class TopologyAtom(Serializable):
         iterator of openff.toolkit.topology.TopologyBonds
         """
 
-        for bond in self._atom.bonds:
-            reference_mol_bond_index = bond.molecule_bond_index
-            yield self._topology_molecule.bond(reference_mol_bond_index)
+        row_ptr, _, bond_indices = self._atom.molecule._bond_graph_csr
+        index = self._atom.molecule_atom_index
+        topology_bonds = self._topology_molecule._topology_bonds
+        for reference_mol_bond_index in bond_indices[
+            row_ptr[index] : row_ptr[index + 1]
+        ].tolist():
+            yield topology_bonds[reference_mol_bond_index]
 
     def __eq__(self, other):
-        return (self._atom == other._atom) and (
-            self._topology_molecule == other._topology_molecule
+        if not isinstance(other, TopologyAtom):
+            return NotImplemented
+        # Atoms and TopologyMolecules are only equal to themselves
+        return (self._atom is other._atom) and (
+            self._topology_molecule is other._topology_molecule
+        )
+
+    def __hash__(self):
+        return self.topology_atom_index
+
+    def __reduce__(self):
+        # Store only the reference atom index, and restore the TopologyMolecule's own wrapper
+        return (
+            _topology_atom_from_index,
+            (self._topology_molecule, self._atom.molecule_atom_index),
         )
 
     def __repr__(self):
@@ -472,12 +622,14 @@ class TopologyBond(Serializable):
     the parent Topology's TopologyMolecule list.
 
     As some systems can be very large, there is no always-existing representation of a TopologyBond. They are created on
-    demand as the user requests them.
+    demand as the user requests them, and then reused by their TopologyMolecule.
 
     .. warning :: This API is experimental and subject to change.
 
     """
 
+    __slots__ = ("_bond", "_topology_molecule")
+
     def __init__(self, bond, topology_molecule):
         """
 
@@ -558,10 +710,32 @@ class TopologyBond(Serializable):
 
         Returns
         -------
-        iterator of openff.toolkit.topology.TopologyAtom
+        tuple of openff.toolkit.topology.TopologyAtom
         """
-        for ref_atom in self._bond.atoms:
-            yield TopologyAtom(ref_atom, self._topology_molecule)
+        topology_atoms = self._topology_molecule._topology_atoms
+        atom1, atom2 = self._bond.atoms
+        return (
+            topology_atoms[atom1.molecule_atom_index],
+            topology_atoms[atom2.molecule_atom_index],
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, TopologyBond):
+            return NotImplemented
+        # Bonds and TopologyMolecules are only equal to themselves
+        return (self._bond is other._bond) and (
+            self._topology_molecule is other._topology_molecule
+        )
+
+    def __hash__(self):
+        return self.topology_bond_index
+
+    def __reduce__(self):
+        # Store only the reference bond index, and restore the TopologyMolecule's own wrapper
+        return (
+            _topology_bond_from_index,
+            (self._topology_molecule, self._bond.molecule_bond_index),
+        )
 
     def to_dict(self):
         """Convert to dictionary representation."""
@@ -594,6 +768,12 @@ class TopologyVirtualSite(Serializable):
 
     """
 
+    __slots__ = (
+        "_virtual_site",
+        "_topology_molecule",
+        "_molecule_virtual_particle_offset",
+    )
+
     def __init__(self, virtual_site, topology_molecule):
         """
 
@@ -607,10 +787,10 @@ class TopologyVirtualSite(Serializable):
         # TODO: Type checks
         self._virtual_site = virtual_site
         self._topology_molecule = topology_molecule
-        self._topology_virtual_particle_start_index = None
+        self._molecule_virtual_particle_offset = None
 
     def invalidate_cached_data(self):
-        self._topology_virtual_particle_start_index = None
+        self._molecule_virtual_particle_offset = None
 
     def atom(self, index):
         """
@@ -626,7 +806,8 @@ class TopologyVirtualSite(Serializable):
         TopologyAtom
 
         """
-        return TopologyAtom(self._virtual_site.atoms[index], self.topology_molecule)
+        ref_atom = self._virtual_site.atoms[index]
+        return self._topology_molecule._topology_atoms[ref_atom.molecule_atom_index]
 
     @property
     def atoms(self):
@@ -635,10 +816,29 @@ class TopologyVirtualSite(Serializable):
 
         Returns
         -------
-        iterator of openff.toolkit.topology.TopologyAtom
+        tuple of openff.toolkit.topology.TopologyAtom
+        """
+        topology_atoms = self._topology_molecule._topology_atoms
+        return tuple(
+            [
+                topology_atoms[ref_atom.molecule_atom_index]
+                for ref_atom in self._virtual_site.atoms
+            ]
+        )
+
+    @property
+    def topology_atom_indices(self):
+        """
+        Get the topology indices of the atoms involved in this TopologyVirtualSite.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            The topology atom index of each atom, in the same order as ``atoms``
         """
-        for ref_atom in self._virtual_site.atoms:
-            yield TopologyAtom(ref_atom, self._topology_molecule)
+        return self._topology_molecule._atom_topology_indices[
+            self._virtual_site._atom_indices
+        ]
 
     @property
     def virtual_site(self):
@@ -702,30 +902,18 @@ class TopologyVirtualSite(Serializable):
         # atoms from all TopologyMolecules first, followed by all VirtualSites
         # from all TopologyMolecules second
 
-        # If the cached value is not available, generate it
-
-        if self._topology_virtual_particle_start_index is None:
-            virtual_particle_start_topology_index = (
-                self.topology_molecule.topology.n_topology_atoms
-            )
-            for (
-                topology_molecule
-            ) in self._topology_molecule._topology.topology_molecules:
-                for tvsite in topology_molecule.virtual_sites:
-                    if self == tvsite:
-                        break
-                    virtual_particle_start_topology_index += tvsite.n_particles
-                if self._topology_molecule == topology_molecule:
-                    break
-                # else:
-                #     virtual_particle_start_topology_index += tvsite.n_particles
-                #     virtual_particle_start_topology_index += topology_molecule.n_particles
-            self._topology_virtual_particle_start_index = (
-                virtual_particle_start_topology_index
+        # Only the offset from the first virtual particle of the TopologyMolecule is
+        # cached, since virtual sites added to other molecules can shift that start
+        if self._molecule_virtual_particle_offset is None:
+            vsite_index = self._virtual_site.molecule_virtual_site_index
+            preceding_vsites = self._virtual_site.molecule.virtual_sites[:vsite_index]
+            self._molecule_virtual_particle_offset = sum(
+                vsite.n_particles for vsite in preceding_vsites
             )
-        # Return cached value
-        # print(self._topology_virtual_particle_start_index)
-        return self._topology_virtual_particle_start_index
+        return (
+            self._topology_molecule.virtual_particle_start_topology_index
+            + self._molecule_virtual_particle_offset
+        )
 
     @property
     def particles(self):
@@ -739,9 +927,7 @@ class TopologyVirtualSite(Serializable):
         """
 
         for vptl in self.virtual_site.particles:
-            yield TopologyVirtualParticle(
-                self._virtual_site, vptl, self._topology_molecule
-            )
+            yield TopologyVirtualParticle(self, vptl, self._topology_molecule)
 
     @property
     def molecule(self):
@@ -766,10 +952,20 @@ class TopologyVirtualSite(Serializable):
         return self._virtual_site.type
 
     def __eq__(self, other):
-        return (self._virtual_site == other._virtual_site) and (
-            self._topology_molecule == other._topology_molecule
+        if not isinstance(other, TopologyVirtualSite):
+            return NotImplemented
+        if self._topology_molecule is not other._topology_molecule:
+            return False
+        # Only fall back to the full VirtualSite comparison for distinct objects
+        return (self._virtual_site is other._virtual_site) or (
+            self._virtual_site == other._virtual_site
         )
 
+    def __hash__(self):
+        # Virtual sites may be added to the reference molecule later, which shifts
+        # topology virtual site indices, so hash by values that cannot change
+        return hash((id(self._topology_molecule), self._virtual_site.name))
+
     def to_dict(self):
         """Convert to dictionary representation."""
         # Implement abstract method Serializable.to_dict()
@@ -788,6 +984,9 @@ class TopologyVirtualSite(Serializable):
 
 
 class TopologyVirtualParticle(TopologyVirtualSite):
+
+    __slots__ = ("_virtual_particle",)
+
     def __init__(self, virtual_site, virtual_particle, topology_molecule):
         self._virtual_site = virtual_site
         self._virtual_particle = virtual_particle
@@ -798,7 +997,7 @@ class TopologyVirtualParticle(TopologyVirtualSite):
         if type(other) != type(self):
             return False
 
-        same_vsite = super() == super(TopologyVirtualParticle, other)
+        same_vsite = self._virtual_site == other._virtual_site
         if not same_vsite:
             return False
 
@@ -843,6 +1042,27 @@ class TopologyMolecule:
 
     """
 
+    __slots__ = (
+        "_reference_molecule",
+        "_topology",
+        "_top_to_ref_index",
+        "_ref_to_top_index",
+        "_topology_molecule_index",
+        "_n_atoms",
+        "_n_bonds",
+        "_atom_start_topology_index",
+        "_particle_start_topology_index",
+        "_bond_start_topology_index",
+        "_virtual_site_start_topology_index",
+        "_virtual_particle_start_topology_index",
+        "_atom_topology_index_array",
+        "_atom_offset_array",
+        "_reference_atom_order_index",
+        "_topology_atom_list",
+        "_topology_bond_list",
+        "_topology_virtual_site_list",
+    )
+
     def __init__(
         self, reference_molecule, topology, local_topology_to_reference_index=None
     ):
@@ -871,12 +1091,91 @@ class TopologyMolecule:
             (k, j) for j, k in local_topology_to_reference_index.items()
         )
 
+        # The index of this TopologyMolecule in the Topology, set by Topology.add_molecule
+        self._topology_molecule_index = None
+
+        # Atoms and bonds are fixed once the reference molecule is in a Topology, but
+        # virtual sites may still be added, so only these counts are stored
+        self._n_atoms = reference_molecule.n_atoms
+        self._n_bonds = reference_molecule.n_bonds
+
         # Initialize cached data
         self._atom_start_topology_index = None
         self._particle_start_topology_index = None
         self._bond_start_topology_index = None
         self._virtual_site_start_topology_index = None
         self._virtual_particle_start_topology_index = None
+        self._atom_topology_index_array = None
+        self._atom_offset_array = None
+        self._reference_atom_order_index = None
+
+        # TopologyAtoms and TopologyBonds are created on first use, and then reused
+        self._topology_atom_list = None
+        self._topology_bond_list = None
+        self._topology_virtual_site_list = None
+
+    def __getstate__(self):
+        # The reference molecule may rebuild its atoms, bonds and virtual sites when
+        # copied, so the cached wrappers are dropped and recreated on demand
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["_topology_atom_list"] = None
+        state["_topology_bond_list"] = None
+        state["_topology_virtual_site_list"] = None
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def _new_copy(self):
+        """
+        Create a TopologyMolecule for another copy of this molecule, with the same atom order.
+
+        Copies of a molecule usually all share one atom order, so the new TopologyMolecule
+        shares the reference molecule and atom index mappings of this one. Creating it
+        does not allocate anything that scales with the number of atoms. Its position in
+        the Topology is left unset.
+
+        Returns
+        -------
+        topology_molecule : openff.toolkit.topology.TopologyMolecule
+        """
+        # Make sure the shared mappings are built once, rather than once per copy
+        self._atom_offsets
+        self._reference_atom_order
+        topology_molecule = TopologyMolecule.__new__(TopologyMolecule)
+        topology_molecule.__setstate__(self.__getstate__())
+        topology_molecule._topology_molecule_index = None
+        topology_molecule._atom_start_topology_index = None
+        topology_molecule._particle_start_topology_index = None
+        topology_molecule._bond_start_topology_index = None
+        topology_molecule._virtual_site_start_topology_index = None
+        topology_molecule._virtual_particle_start_topology_index = None
+        topology_molecule._atom_topology_index_array = None
+        return topology_molecule
+
+    def _count_preceding(self, count):
+        """
+        Sum a count over the TopologyMolecules that precede this one in its Topology.
+
+        This is the fallback for the start index properties when this TopologyMolecule was
+        not added through Topology.add_molecule.
+
+        Parameters
+        ----------
+        count : callable
+            Function returning the count for a TopologyMolecule
+
+        Returns
+        -------
+        total : int
+        """
+        total = 0
+        for topology_molecule in self._topology.topology_molecules:
+            if self is topology_molecule:
+                break
+            total += count(topology_molecule)
+        return total
 
     def _invalidate_cached_data(self):
         """Unset all cached data, in response to an appropriate change"""
@@ -885,6 +1184,7 @@ class TopologyMolecule:
         self._bond_start_topology_index = None
         self._virtual_site_start_topology_index = None
         self._virtual_particle_start_topology_index = None
+        self._atom_topology_index_array = None
         for vsite in self.virtual_sites:
             vsite.invalidate_cached_data()
 
@@ -919,7 +1219,7 @@ class TopologyMolecule:
         -------
         int
         """
-        return self._reference_molecule.n_atoms
+        return self._n_atoms
 
     def atom(self, index):
         """
@@ -935,7 +1235,7 @@ class TopologyMolecule:
         an openff.toolkit.topology.TopologyAtom
         """
         ref_mol_atom_index = self._top_to_ref_index[index]
-        return TopologyAtom(self._reference_molecule.atoms[ref_mol_atom_index], self)
+        return self._topology_atoms[ref_mol_atom_index]
 
     @property
     def atoms(self):
@@ -946,12 +1246,183 @@ class TopologyMolecule:
         -------
         an iterator of openff.toolkit.topology.TopologyAtoms
         """
-        iterate_order = list(self._top_to_ref_index.items())
-        # Sort by topology index
-        iterate_order.sort(key=lambda x: x[0])
-        for top_index, ref_index in iterate_order:
-            # self._reference_molecule.atoms:
-            yield TopologyAtom(self._reference_molecule.atoms[ref_index], self)
+        return iter(self._topology_atoms_in_order())
+
+    def _topology_atoms_in_order(self):
+        """
+        List the TopologyAtoms in this TopologyMolecule, in TopologyMolecule atom order
+
+        Returns
+        -------
+        list of openff.toolkit.topology.TopologyAtom
+        """
+        ref_order = self._reference_atom_order
+        topology_atoms = self._topology_atoms
+        if isinstance(ref_order, slice):
+            return topology_atoms
+        return [topology_atoms[ref_index] for ref_index in ref_order.tolist()]
+
+    @property
+    def _topology_atoms(self):
+        """
+        List of the TopologyAtoms in this TopologyMolecule, in reference molecule order
+
+        Returns
+        -------
+        list of openff.toolkit.topology.TopologyAtom
+        """
+        if self._topology_atom_list is None:
+            self._topology_atom_list = [
+                TopologyAtom(atom, self) for atom in self._reference_molecule.atoms
+            ]
+        return self._topology_atom_list
+
+    @property
+    def _topology_bonds(self):
+        """
+        List of the TopologyBonds in this TopologyMolecule, in reference molecule order
+
+        Returns
+        -------
+        list of openff.toolkit.topology.TopologyBond
+        """
+        if self._topology_bond_list is None:
+            self._topology_bond_list = [
+                TopologyBond(bond, self) for bond in self._reference_molecule.bonds
+            ]
+        return self._topology_bond_list
+
+    @property
+    def _topology_virtual_sites(self):
+        """
+        List of the TopologyVirtualSites in this TopologyMolecule, in reference molecule order
+
+        Virtual sites may be added to or replaced in the reference molecule at any time,
+        so the list is rebuilt whenever it no longer wraps the reference virtual sites.
+
+        Returns
+        -------
+        list of openff.toolkit.topology.TopologyVirtualSite
+        """
+        vsites = self._reference_molecule.virtual_sites
+        tvsites = self._topology_virtual_site_list
+        if (
+            tvsites is None
+            or len(tvsites) != len(vsites)
+            or any(
+                tvsite._virtual_site is not vsite
+                for tvsite, vsite in zip(tvsites, vsites)
+            )
+        ):
+            tvsites = [TopologyVirtualSite(vsite, self) for vsite in vsites]
+            self._topology_virtual_site_list = tvsites
+        return tvsites
+
+    @property
+    def _atom_topology_indices(self):
+        """
+        Array of the topology atom index of each atom in this TopologyMolecule, in reference molecule order
+
+        Returns
+        -------
+        numpy.ndarray of int
+        """
+        if self._atom_topology_index_array is None:
+            self._atom_topology_index_array = (
+                self.atom_start_topology_index + self._atom_offsets
+            )
+        return self._atom_topology_index_array
+
+    @property
+    def _atom_offsets(self):
+        """
+        Array of the index of each atom within this TopologyMolecule, in reference molecule order
+
+        Returns
+        -------
+        numpy.ndarray of int
+        """
+        if self._atom_offset_array is None:
+            ref_to_top_index = self._ref_to_top_index
+            self._atom_offset_array = np.array(
+                [ref_to_top_index[i] for i in range(self.n_atoms)], dtype=np.int32
+            )
+        return self._atom_offset_array
+
+    @property
+    def _reference_atom_order(self):
+        """
+        Index that reorders per-atom reference molecule arrays into the atom order of this TopologyMolecule.
+
+        This is a full slice when both orders agree, so indexing with it returns a view rather than a copy.
+
+        Returns
+        -------
+        slice or numpy.ndarray of int
+        """
+        if self._reference_atom_order_index is None:
+            top_to_ref_index = self._top_to_ref_index
+            ref_order = np.array(
+                [top_to_ref_index[i] for i in range(self.n_atoms)], dtype=np.int32
+            )
+            if np.array_equal(ref_order, np.arange(self.n_atoms)):
+                self._reference_atom_order_index = slice(None)
+            else:
+                self._reference_atom_order_index = ref_order
+        return self._reference_atom_order_index
+
+    @property
+    def atomic_numbers(self):
+        """
+        The atomic numbers of the atoms in this TopologyMolecule, in TopologyMolecule atom order.
+
+        The returned array is read-only, and is a view of the reference molecule's array where possible.
+
+        Returns
+        -------
+        atomic_numbers : numpy.ndarray of int8 of shape (n_atoms,)
+        """
+        return self._reference_molecule._atomic_numbers_array[
+            self._reference_atom_order
+        ]
+
+    @property
+    def formal_charges(self):
+        """
+        The formal charges of the atoms in this TopologyMolecule, in TopologyMolecule atom order.
+
+        Returns
+        -------
+        formal_charges : numpy.ndarray of int8 of shape (n_atoms,)
+            The formal charges, in units of elementary charge
+        """
+        formal_charges = np.fromiter(
+            (
+                atom.formal_charge.value_in_unit(unit.elementary_charge)
+                for atom in self._reference_molecule.atoms
+            ),
+            dtype=np.int8,
+            count=self.n_atoms,
+        )
+        return formal_charges[self._reference_atom_order]
+
+    @property
+    def partial_charges(self):
+        """
+        The partial charges of the atoms in this TopologyMolecule, in TopologyMolecule atom order.
+
+        Returns
+        -------
+        partial_charges : simtk.unit.Quantity wrapping numpy.ndarray of shape (n_atoms,), or None
+            The partial charges in units of elementary charge, or None if the reference molecule has none
+        """
+        partial_charges = self._reference_molecule.partial_charges
+        if partial_charges is None:
+            return None
+        partial_charges = partial_charges.value_in_unit(unit.elementary_charge)
+        return unit.Quantity(
+            partial_charges[self._reference_atom_order], unit.elementary_charge
+        )
 
     @property
     def atom_start_topology_index(self):
@@ -959,14 +1430,12 @@ class TopologyMolecule:
         Get the topology index of the first atom in this TopologyMolecule
 
         """
-        # If cached value is not available, generate it.
+        # If cached value is not available, generate it. It is set by
+        # Topology.add_molecule, so this is only needed for molecules built directly.
         if self._atom_start_topology_index is None:
-            atom_start_topology_index = 0
-            for topology_molecule in self._topology.topology_molecules:
-                if self == topology_molecule:
-                    self._atom_start_topology_index = atom_start_topology_index
-                    break
-                atom_start_topology_index += topology_molecule.n_atoms
+            self._atom_start_topology_index = self._count_preceding(
+                lambda topology_molecule: topology_molecule.n_atoms
+            )
 
         # Return cached value
         return self._atom_start_topology_index
@@ -977,18 +1446,22 @@ class TopologyMolecule:
         Get the topology index of the first virtual particle in this TopologyMolecule
 
         """
+        if self._topology_molecule_index is not None:
+            (
+                _,
+                virtual_particle_starts,
+            ) = self._topology._virtual_start_topology_indices()
+            return int(virtual_particle_starts[self._topology_molecule_index])
         # If cached value is not available, generate it.
         if self._virtual_particle_start_topology_index is None:
-            particle_start_topology_index = self.topology.n_atoms
-            for topology_molecule in self._topology.topology_molecules:
-                if self == topology_molecule:
-                    self._particle_start_topology_index = particle_start_topology_index
-                    break
-                offset = sum(
-                    [vsite.n_particles for vsite in topology_molecule.virtual_sites]
+            self._virtual_particle_start_topology_index = (
+                self.topology.n_topology_atoms
+                + self._count_preceding(
+                    lambda topology_molecule: (
+                        topology_molecule.reference_molecule.n_virtual_particles
+                    )
                 )
-                particle_start_topology_index += offset
-            self._virtual_particle_start_topology_index = particle_start_topology_index
+            )
         # Return cached value
         return self._virtual_particle_start_topology_index
 
@@ -1005,7 +1478,7 @@ class TopologyMolecule:
         -------
         an openff.toolkit.topology.TopologyBond
         """
-        return TopologyBond(self.reference_molecule.bonds[index], self)
+        return self._topology_bonds[index]
 
     @property
     def bonds(self):
@@ -1016,8 +1489,19 @@ class TopologyMolecule:
         -------
         an iterator of openff.toolkit.topology.TopologyBonds
         """
-        for bond in self._reference_molecule.bonds:
-            yield TopologyBond(bond, self)
+        return iter(self._topology_bonds)
+
+    @property
+    def bond_topology_atom_indices(self):
+        """
+        Get the topology atom indices of the atoms in each bond of this TopologyMolecule.
+
+        Returns
+        -------
+        numpy.ndarray of int of shape (n_bonds, 2)
+            The topology indices of ``atom1`` and ``atom2`` of each bond, in the same order as ``bonds``
+        """
+        return self._atom_topology_indices[self._reference_molecule._bond_atom_indices]
 
     @property
     def n_bonds(self):
@@ -1027,19 +1511,17 @@ class TopologyMolecule:
         -------
         int : number of bonds
         """
-        return self._reference_molecule.n_bonds
+        return self._n_bonds
 
     @property
     def bond_start_topology_index(self):
         """Get the topology index of the first bond in this TopologyMolecule"""
-        # If cached value is not available, generate it.
+        # If cached value is not available, generate it. It is set by
+        # Topology.add_molecule, so this is only needed for molecules built directly.
         if self._bond_start_topology_index is None:
-            bond_start_topology_index = 0
-            for topology_molecule in self._topology.topology_molecules:
-                if self == topology_molecule:
-                    self._bond_start_topology_index = bond_start_topology_index
-                    break
-                bond_start_topology_index += topology_molecule.n_bonds
+            self._bond_start_topology_index = self._count_preceding(
+                lambda topology_molecule: topology_molecule.n_bonds
+            )
 
         # Return cached value
         return self._bond_start_topology_index
@@ -1055,9 +1537,22 @@ class TopologyMolecule:
 
         Returns
         -------
-        an openff.toolkit.topology.TopologyParticle
+        an openff.toolkit.topology.TopologyAtom or openff.toolkit.topology.TopologyVirtualParticle
         """
-        return TopologyParticle(self.reference_molecule.particles[index], self)
+        # Particles are ordered with all atoms first, followed by the particles of each
+        # virtual site in turn, so this avoids building the reference particle list
+        if index < 0:
+            index += self.n_particles
+        if 0 <= index < self.n_atoms:
+            return self._topology_atoms[index]
+        if index >= self.n_atoms:
+            offset = index - self.n_atoms
+            for tvsite in self._topology_virtual_sites:
+                if offset < tvsite.n_particles:
+                    vptl = list(tvsite.virtual_site.particles)[offset]
+                    return TopologyVirtualParticle(tvsite, vptl, self)
+                offset -= tvsite.n_particles
+        raise IndexError(f"Particle index {index} is out of range")
 
     @property
     def particles(self):
@@ -1069,17 +1564,10 @@ class TopologyMolecule:
         an iterator of openff.toolkit.topology.TopologyParticle
         """
         # Note: This assumes that particles are all Atoms (in topology map order), and then virtualsites
-        yield_order = list(self._top_to_ref_index.items())
-        # Sort by topology atom index
-        yield_order.sort(key=lambda x: x[0])
-        for top_atom_index, ref_mol_atom_index in yield_order:
-            ref_atom = self._reference_molecule.atoms[ref_mol_atom_index]
-            yield TopologyAtom(ref_atom, self)
+        yield from self._topology_atoms_in_order()
 
-        for vsite in self.reference_molecule.virtual_sites:
-            tvsite = TopologyVirtualSite(vsite, self)
-            for vptl in vsite.particles:
-                yield TopologyVirtualParticle(tvsite, vptl, self)
+        for tvsite in self._topology_virtual_sites:
+            yield from tvsite.particles
 
     @property
     def n_particles(self):
@@ -1104,7 +1592,7 @@ class TopologyMolecule:
         -------
         an openff.toolkit.topology.TopologyVirtualSite
         """
-        return TopologyVirtualSite(self.reference_molecule.virtual_sites[index], self)
+        return self._topology_virtual_sites[index]
 
     @property
     def virtual_sites(self):
@@ -1115,8 +1603,7 @@ class TopologyMolecule:
         -------
         an iterator of openff.toolkit.topology.TopologyVirtualSite
         """
-        for vsite in self._reference_molecule.virtual_sites:
-            yield TopologyVirtualSite(vsite, self)
+        return iter(self._topology_virtual_sites)
 
     @property
     def n_virtual_sites(self):
@@ -1226,15 +1713,14 @@ class TopologyMolecule:
     @property
     def virtual_site_start_topology_index(self):
         """Get the topology index of the first virtual site in this TopologyMolecule"""
+        if self._topology_molecule_index is not None:
+            virtual_site_starts, _ = self._topology._virtual_start_topology_indices()
+            return int(virtual_site_starts[self._topology_molecule_index])
         # If the cached value is not available, generate it
         if self._virtual_site_start_topology_index is None:
-            virtual_site_start_topology_index = 0
-            for topology_molecule in self._topology.topology_molecules:
-                if self == topology_molecule:
-                    self._virtual_site_start_topology_index = (
-                        virtual_site_start_topology_index
-                    )
-                virtual_site_start_topology_index += topology_molecule.n_virtual_sites
+            self._virtual_site_start_topology_index = self._count_preceding(
+                lambda topology_molecule: topology_molecule.n_virtual_sites
+            )
         # Return cached value
         return self._virtual_site_start_topology_index
 
@@ -1349,20 +1835,76 @@ class Topology(Serializable):
         self._box_vectors = None
         # self._reference_molecule_dicts = set()
         # TODO: Look into weakref and what it does. Having multiple topologies might cause a memory leak.
-        self._reference_molecule_to_topology_molecules = OrderedDict()
+        self._reference_molecule_to_topology_molecules = dict()
+        # Map of the SMILES of each reference molecule to the reference molecule
+        self._smiles_to_reference_molecule = dict()
         self._topology_molecules = list()
+        # Atoms and bonds are fixed once a molecule is added, so their totals are
+        # kept up to date by add_molecule
+        self._n_topology_atoms = 0
+        self._n_topology_bonds = 0
+        self._atom_start_topology_indices = list()
+        self._bond_start_topology_indices = list()
+        # For each reference molecule, the groups of its TopologyMolecules that share an
+        # atom mapping, as [first TopologyMolecule, atom start buffer, number of copies]
+        self._atom_start_topology_index_groups = dict()
+        # Results of chemical_environment_matches, keyed by (SMARTS, toolkit registry)
+        self._chemical_environment_matches_cache = dict()
+        self._virtual_start_topology_indices_key = None
+        self._virtual_start_topology_indices_cache = None
+
+    def _virtual_start_topology_indices(self):
+        """
+        Get the topology indices of the first virtual site and first virtual particle of each TopologyMolecule.
+
+        Virtual sites can be added to reference molecules after they join the Topology, so
+        these offsets are rebuilt whenever the molecules or their virtual sites change.
+
+        Returns
+        -------
+        virtual_site_starts : numpy.ndarray of int of shape (n_topology_molecules,)
+        virtual_particle_starts : numpy.ndarray of int of shape (n_topology_molecules,)
+        """
+        key = (len(self._topology_molecules),) + tuple(
+            (id(vsite), vsite.n_particles)
+            for ref_mol in self._reference_molecule_to_topology_molecules
+            for vsite in ref_mol.virtual_sites
+        )
+        if key != self._virtual_start_topology_indices_key:
+            counts = {
+                id(ref_mol): (
+                    ref_mol.n_virtual_sites,
+                    sum(vsite.n_particles for vsite in ref_mol.virtual_sites),
+                )
+                for ref_mol in self._reference_molecule_to_topology_molecules
+            }
+            n_virtuals = np.array(
+                [
+                    counts[id(topology_molecule.reference_molecule)]
+                    for topology_molecule in self._topology_molecules
+                ],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+            # Exclusive cumulative sums give the start index of each molecule
+            starts = np.cumsum(n_virtuals, axis=0) - n_virtuals
+            starts[:, 1] += self.n_topology_atoms
+            self._virtual_start_topology_indices_cache = (starts[:, 0], starts[:, 1])
+            self._virtual_start_topology_indices_key = key
+        return self._virtual_start_topology_indices_cache
 
     @property
     def reference_molecules(self):
         """
-        Get an iterator of reference molecules in this Topology.
+        Get the reference molecules in this Topology.
+
+        This is a live view rather than a generator, so it can be iterated over more than
+        once and supports ``len()``.
 
         Returns
         -------
         iterable of openff.toolkit.topology.Molecule
         """
-        for ref_mol in self._reference_molecule_to_topology_molecules.keys():
-            yield ref_mol
+        return self._reference_molecule_to_topology_molecules.keys()
 
     @classmethod
     def from_molecules(cls, molecules):
@@ -1403,7 +1945,9 @@ class Topology(Serializable):
             The atoms or atom topology indices to check to ensure they are bonded
 
         """
-        if (type(atom1) is int) and (type(atom2) is int):
+        if isinstance(atom1, (int, np.integer)) and isinstance(
+            atom2, (int, np.integer)
+        ):
             atom1 = self.atom(atom1)
             atom2 = self.atom(atom2)
 
@@ -1559,7 +2103,12 @@ class Topology(Serializable):
         constrained_atom_pairs : dict
              dictionary of the form d[(atom1_topology_index, atom2_topology_index)] = distance (float)
         """
-        return self._constrained_atom_pairs
+        # Each pair is only stored once, so list it in both orders
+        constrained_atom_pairs = dict()
+        for (iatom, jatom), distance in self._constrained_atom_pairs.items():
+            constrained_atom_pairs[(iatom, jatom)] = distance
+            constrained_atom_pairs[(jatom, iatom)] = distance
+        return constrained_atom_pairs
 
     @property
     def fractional_bond_order_model(self):
@@ -1602,10 +2151,7 @@ class Topology(Serializable):
         -------
         n_reference_molecules : int
         """
-        count = 0
-        for i in self.reference_molecules:
-            count += 1
-        return count
+        return len(self._reference_molecule_to_topology_molecules)
 
     @property
     def n_topology_molecules(self):
@@ -1637,14 +2183,7 @@ class Topology(Serializable):
         -------
         n_topology_atoms : int
         """
-        n_atoms = 0
-        for reference_molecule in self.reference_molecules:
-            n_atoms_per_topology_molecule = reference_molecule.n_atoms
-            n_instances_of_topology_molecule = len(
-                self._reference_molecule_to_topology_molecules[reference_molecule]
-            )
-            n_atoms += n_atoms_per_topology_molecule * n_instances_of_topology_molecule
-        return n_atoms
+        return self._n_topology_atoms
 
     @property
     def topology_atoms(self):
@@ -1655,9 +2194,106 @@ class Topology(Serializable):
         -------
         topology_atoms : Iterable of TopologyAtom
         """
-        for topology_molecule in self._topology_molecules:
-            for atom in topology_molecule.atoms:
-                yield atom
+        return itertools.chain.from_iterable(
+            topology_molecule.atoms for topology_molecule in self._topology_molecules
+        )
+
+    def all_atom_topology_indices(self):
+        """
+        Get the topology atom indices of all atoms in this Topology, as a single array.
+
+        The atoms of each TopologyMolecule are listed in the order of its reference molecule, so that
+        ``all_atom_topology_indices()[topology_molecule.atom_start_topology_index + atom.molecule_atom_index]``
+        is the topology index of the TopologyAtom corresponding to reference atom ``atom``.
+
+        Returns
+        -------
+        topology_atom_indices : numpy.ndarray of int of shape (n_topology_atoms,)
+        """
+        topology_atom_indices = np.empty(self.n_topology_atoms, dtype=np.int32)
+        for ref_mol in self._reference_molecule_to_topology_molecules:
+            for atom_starts, atom_offsets in self._atom_offset_groups(ref_mol):
+                positions = atom_starts + np.arange(len(atom_offsets), dtype=np.int32)
+                topology_atom_indices[positions] = atom_starts + atom_offsets
+        return topology_atom_indices
+
+    def atomic_numbers_array(self):
+        """
+        Get the atomic numbers of all atoms in this Topology, in topology atom order.
+
+        Returns
+        -------
+        atomic_numbers : numpy.ndarray of int16 of shape (n_topology_atoms,)
+        """
+        return self._atom_property_array(
+            lambda ref_mol: ref_mol._atomic_numbers_array, np.int16
+        )
+
+    def masses_array(self):
+        """
+        Get the masses of all atoms in this Topology, in topology atom order.
+
+        Returns
+        -------
+        masses : simtk.unit.Quantity wrapping numpy.ndarray of float of shape (n_topology_atoms,)
+        """
+        masses = self._atom_property_array(
+            lambda ref_mol: [
+                atom.mass.value_in_unit(unit.dalton) for atom in ref_mol.atoms
+            ],
+            np.float64,
+        )
+        return unit.Quantity(masses, unit.dalton)
+
+    def _atom_property_array(self, getter, dtype):
+        """
+        Gather a per-atom property into an array in topology atom order.
+
+        The property is only evaluated once for each reference molecule, and then
+        scattered to every TopologyMolecule of that reference molecule.
+
+        Parameters
+        ----------
+        getter : callable
+            Function returning the property values of a reference molecule, in reference atom order
+        dtype : numpy.dtype
+            The dtype of the returned array
+
+        Returns
+        -------
+        values : numpy.ndarray of shape (n_topology_atoms,)
+        """
+        values = np.empty(self.n_topology_atoms, dtype=dtype)
+        for ref_mol in self._reference_molecule_to_topology_molecules:
+            ref_values = np.asarray(getter(ref_mol), dtype=dtype)
+            for atom_starts, atom_offsets in self._atom_offset_groups(ref_mol):
+                values[atom_starts + atom_offsets] = ref_values
+        return values
+
+    def _atom_offset_groups(self, reference_molecule):
+        """
+        Iterate over the groups of copies of a reference molecule that share an atom index mapping.
+
+        Copies of a molecule with the same atom order share their index mappings, so
+        each group of copies can be handled with a single broadcast. The atom start
+        indices of each group are kept up to date by ``add_molecule``.
+
+        Parameters
+        ----------
+        reference_molecule : openff.toolkit.topology.FrozenMolecule
+            A reference molecule of this Topology
+
+        Yields
+        ------
+        atom_starts : numpy.ndarray of int of shape (n_copies, 1)
+            The topology index of the first atom of each TopologyMolecule in the group
+        atom_offsets : numpy.ndarray of int of shape (n_atoms,)
+            The index within its TopologyMolecule of each atom, in reference molecule order
+        """
+        for group in self._atom_start_topology_index_groups[reference_molecule]:
+            first_topology_molecule, atom_starts, n_copies = group
+            atom_offsets = first_topology_molecule._atom_offsets
+            yield atom_starts[:n_copies, np.newaxis], atom_offsets
 
     @property
     def n_topology_bonds(self):
@@ -1668,14 +2304,7 @@ class Topology(Serializable):
         -------
         n_bonds : int
         """
-        n_bonds = 0
-        for reference_molecule in self.reference_molecules:
-            n_bonds_per_topology_molecule = reference_molecule.n_bonds
-            n_instances_of_topology_molecule = len(
-                self._reference_molecule_to_topology_molecules[reference_molecule]
-            )
-            n_bonds += n_bonds_per_topology_molecule * n_instances_of_topology_molecule
-        return n_bonds
+        return self._n_topology_bonds
 
     @property
     def topology_bonds(self):
@@ -1685,9 +2314,9 @@ class Topology(Serializable):
         -------
         topology_bonds : Iterable of TopologyBond
         """
-        for topology_molecule in self._topology_molecules:
-            for bond in topology_molecule.bonds:
-                yield bond
+        return itertools.chain.from_iterable(
+            topology_molecule.bonds for topology_molecule in self._topology_molecules
+        )
 
     @property
     def n_topology_particles(self):
@@ -1698,16 +2327,13 @@ class Topology(Serializable):
         -------
         n_topology_particles : int
         """
-        n_particles = 0
-        for reference_molecule in self.reference_molecules:
-            n_particles_per_topology_molecule = reference_molecule.n_particles
-            n_instances_of_topology_molecule = len(
-                self._reference_molecule_to_topology_molecules[reference_molecule]
-            )
-            n_particles += (
-                n_particles_per_topology_molecule * n_instances_of_topology_molecule
-            )
-        return n_particles
+        return self._n_topology_atoms + sum(
+            reference_molecule.n_virtual_particles * len(topology_molecules)
+            for (
+                reference_molecule,
+                topology_molecules,
+            ) in self._reference_molecule_to_topology_molecules.items()
+        )
 
     @property
     def topology_particles(self):
@@ -1719,13 +2345,14 @@ class Topology(Serializable):
         --------
         topology_particles : Iterable of TopologyAtom and TopologyVirtualSite
         """
-        for topology_molecule in self._topology_molecules:
-            for atom in topology_molecule.atoms:
-                yield atom
-        for topology_molecule in self._topology_molecules:
-            for vs in topology_molecule.virtual_sites:
-                for vp in vs.particles:
-                    yield vp
+        return itertools.chain(
+            self.topology_atoms,
+            itertools.chain.from_iterable(
+                vs.particles
+                for topology_molecule in self._topology_molecules
+                for vs in topology_molecule.virtual_sites
+            ),
+        )
 
     @property
     def n_topology_virtual_sites(self):
@@ -1736,16 +2363,13 @@ class Topology(Serializable):
         -------
         n_virtual_sites : iterable of TopologyVirtualSites
         """
-        n_virtual_sites = 0
-        for reference_molecule in self.reference_molecules:
-            n_virtual_sites_per_topology_molecule = reference_molecule.n_virtual_sites
-            n_instances_of_topology_molecule = len(
-                self._reference_molecule_to_topology_molecules[reference_molecule]
-            )
-            n_virtual_sites += (
-                n_virtual_sites_per_topology_molecule * n_instances_of_topology_molecule
-            )
-        return n_virtual_sites
+        return sum(
+            reference_molecule.n_virtual_sites * len(topology_molecules)
+            for (
+                reference_molecule,
+                topology_molecules,
+            ) in self._reference_molecule_to_topology_molecules.items()
+        )
 
     @property
     def topology_virtual_sites(self):
@@ -1755,9 +2379,10 @@ class Topology(Serializable):
         -------
         topology_virtual_sites : Iterable of TopologyVirtualSite
         """
-        for topology_molecule in self._topology_molecules:
-            for virtual_site in topology_molecule.virtual_sites:
-                yield virtual_site
+        return itertools.chain.from_iterable(
+            topology_molecule.virtual_sites
+            for topology_molecule in self._topology_molecules
+        )
 
     @property
     def n_angles(self):
@@ -1768,8 +2393,7 @@ class Topology(Serializable):
     def angles(self):
         """Iterable of Tuple[TopologyAtom]: iterator over the angles in this Topology."""
         for topology_molecule in self._topology_molecules:
-            for angle in topology_molecule.angles:
-                yield angle
+            yield from topology_molecule.angles
 
     @property
     def n_propers(self):
@@ -1780,8 +2404,7 @@ class Topology(Serializable):
     def propers(self):
         """Iterable of Tuple[TopologyAtom]: iterator over the proper torsions in this Topology."""
         for topology_molecule in self._topology_molecules:
-            for proper in topology_molecule.propers:
-                yield proper
+            yield from topology_molecule.propers
 
     @property
     def n_impropers(self):
@@ -1792,8 +2415,7 @@ class Topology(Serializable):
     def impropers(self):
         """Iterable of Tuple[TopologyAtom]: iterator over the possible improper torsions in this Topology."""
         for topology_molecule in self._topology_molecules:
-            for improper in topology_molecule.impropers:
-                yield improper
+            yield from topology_molecule.impropers
 
     @property
     def smirnoff_impropers(self):
@@ -1831,8 +2453,7 @@ class Topology(Serializable):
 
         """
         for topology_molecule in self._topology_molecules:
-            for smirnoff_improper in topology_molecule.smirnoff_impropers:
-                yield smirnoff_improper
+            yield from topology_molecule.smirnoff_impropers
 
     @property
     def amber_impropers(self):
@@ -1861,13 +2482,11 @@ class Topology(Serializable):
         impropers, smirnoff_impropers
         """
         for topology_molecule in self._topology_molecules:
-            for amber_improper in topology_molecule.amber_impropers:
-                yield amber_improper
+            yield from topology_molecule.amber_impropers
 
     def nth_degree_neighbors(self, n_degrees: int):
         for topology_molecule in self._topology_molecules:
-            for pair in topology_molecule.nth_degree_neighbors(n_degrees=n_degrees):
-                yield pair
+            yield from topology_molecule.nth_degree_neighbors(n_degrees=n_degrees)
 
     class _ChemicalEnvironmentMatch:
         """Represents the match of a given chemical environment query, storing
@@ -1875,6 +2494,13 @@ class Topology(Serializable):
         reference molecule atoms, as well as a reference to the reference molecule.
         """
 
+        # One of these is created per match per molecule copy
+        __slots__ = (
+            "_reference_atom_indices",
+            "_reference_molecule",
+            "_topology_atom_indices",
+        )
+
         @property
         def reference_atom_indices(self):
             """tuple of int: The indices of the corresponding reference molecule atoms."""
@@ -1940,15 +2566,22 @@ class Topology(Serializable):
         """
 
         # Render the query to a SMARTS string
-        if type(query) is str:
+        if isinstance(query, str):
             smarts = query
-        elif type(query) is ChemicalEnvironment:
+        elif isinstance(query, ChemicalEnvironment):
             smarts = query.as_smarts()
         else:
             raise ValueError(
                 f"Don't know how to convert query '{query}' into SMARTS string"
             )
 
+        # Parameter handlers often query the same SMARTS more than once, and the
+        # reference molecules are not changed once they are in the Topology, so the
+        # matches can be reused until another molecule is added
+        cache_key = (smarts, toolkit_registry)
+        if cache_key in self._chemical_environment_matches_cache:
+            return list(self._chemical_environment_matches_cache[cache_key])
+
         # Perform matching on each unique molecule, unrolling the matches to all matching copies
         # of that molecule in the Topology object.
         matches = list()
@@ -1965,33 +2598,44 @@ class Topology(Serializable):
             if len(ref_mol_matches) == 0:
                 continue
 
-            # Unroll corresponding atom indices over all instances of this molecule.
-            for topology_molecule in self._reference_molecule_to_topology_molecules[
-                ref_mol
-            ]:
-
-                # topology_molecule_start_index = topology_molecule.atom_start_topology_index
-
-                # Loop over matches
-                for reference_match in ref_mol_matches:
-
-                    # Collect indices of matching TopologyAtoms.
-                    topology_atom_indices = []
-                    for reference_molecule_atom_index in reference_match:
-                        reference_atom = topology_molecule.reference_molecule.atoms[
-                            reference_molecule_atom_index
-                        ]
-                        topology_atom = TopologyAtom(reference_atom, topology_molecule)
-                        topology_atom_indices.append(
-                            topology_atom.topology_particle_index
-                        )
-
-                    environment_match = Topology._ChemicalEnvironmentMatch(
-                        tuple(reference_match), ref_mol, tuple(topology_atom_indices)
-                    )
+            # All matches of one SMARTS pattern tag the same number of atoms, so the
+            # matches of each copy can be mapped to topology indices in one go
+            reference_matches = [
+                tuple(reference_match) for reference_match in ref_mol_matches
+            ]
+            reference_match_array = np.array(reference_matches, dtype=np.int32)
+
+            # Unroll corresponding atom indices over all instances of this molecule,
+            # broadcasting over each group of copies that share an atom mapping.
+            # Atoms come before virtual particles, so topology particle indices of
+            # atoms are the same as their topology atom indices
+            copy_starts = []
+            copy_matches = []
+            for atom_starts, atom_offsets in self._atom_offset_groups(ref_mol):
+                copy_starts.append(atom_starts[:, 0])
+                copy_matches.append(
+                    atom_starts[:, :, np.newaxis] + atom_offsets[reference_match_array]
+                )
+            # Restore the order of the copies in the Topology
+            copy_order = np.argsort(np.concatenate(copy_starts), kind="stable")
+            topology_matches = np.concatenate(copy_matches)[copy_order]
+            n_copies = len(topology_matches)
+
+            # Flatten to one row per match, with the matches of each copy in turn
+            topology_matches = topology_matches.reshape(
+                -1, reference_match_array.shape[1]
+            ).tolist()
+            matches.extend(
+                Topology._ChemicalEnvironmentMatch(
+                    reference_match, ref_mol, tuple(topology_atom_indices)
+                )
+                for reference_match, topology_atom_indices in zip(
+                    reference_matches * n_copies, topology_matches
+                )
+            )
 
-                    matches.append(environment_match)
-        return matches
+        self._chemical_environment_matches_cache[cache_key] = matches
+        return list(matches)
 
     def to_dict(self):
         """Convert to dictionary representation."""
@@ -2080,10 +2724,9 @@ class Topology(Serializable):
         from openff.toolkit.topology.molecule import Molecule
 
         # Check to see if the openMM system has defined bond orders, by looping over all Bonds in the Topology.
-        omm_has_bond_orders = True
-        for omm_bond in openmm_topology.bonds():
-            if omm_bond.order is None:
-                omm_has_bond_orders = False
+        omm_has_bond_orders = not any(
+            omm_bond.order is None for omm_bond in openmm_topology.bonds()
+        )
 
         if unique_molecules is None:
             raise MissingUniqueMoleculesError(
@@ -2091,12 +2734,23 @@ class Topology(Serializable):
                 "passed as unique_molecules, but None was passed."
             )
 
+        def graph_hash(graph):
+            # Isomorphic graphs always have the same hash, so only graphs with equal
+            # hashes need to be compared with the (much more expensive) isomorphism check
+            return nx.weisfeiler_lehman_graph_hash(
+                graph,
+                node_attr="atomic_number",
+                edge_attr="bond_order" if omm_has_bond_orders else None,
+            )
+
         # Convert all unique mols to graphs
         topology = cls()
-        graph_to_unq_mol = {}
+        # Pairs of (graph, unique molecule), bucketed by graph hash
+        hash_to_unq_mol_graphs = defaultdict(list)
         for unq_mol in unique_molecules:
             unq_mol_graph = unq_mol.to_networkx()
-            for existing_graph in graph_to_unq_mol.keys():
+            unq_mol_hash = graph_hash(unq_mol_graph)
+            for existing_graph, existing_mol in hash_to_unq_mol_graphs[unq_mol_hash]:
                 if Molecule.are_isomorphic(
                     existing_graph,
                     unq_mol_graph,
@@ -2109,32 +2763,71 @@ class Topology(Serializable):
                 )[0]:
                     msg = (
                         "Error: Two unique molecules have indistinguishable "
-                        "graphs: {} and {}".format(
-                            unq_mol, graph_to_unq_mol[existing_graph]
-                        )
+                        "graphs: {} and {}".format(unq_mol, existing_mol)
                     )
                     raise DuplicateUniqueMoleculeError(msg)
-            graph_to_unq_mol[unq_mol_graph] = unq_mol
+            hash_to_unq_mol_graphs[unq_mol_hash].append((unq_mol_graph, unq_mol))
 
         # Convert all openMM mols to graphs
         omm_topology_G = nx.Graph()
-        for atom in openmm_topology.atoms():
-            omm_topology_G.add_node(
-                atom.index, atomic_number=atom.element.atomic_number
+        omm_topology_G.add_nodes_from(
+            (atom.index, {"atomic_number": atom.element.atomic_number})
+            for atom in openmm_topology.atoms()
+        )
+        omm_topology_G.add_edges_from(
+            (bond.atom1.index, bond.atom2.index, {"bond_order": bond.order})
+            for bond in openmm_topology.bonds()
+        )
+
+        def component_key(component):
+            # Copies of a molecule written out atom-for-atom in the same order (as
+            # solvent usually is) have the same key, so they share one match
+            first_index = min(component)
+            atoms = tuple(
+                sorted(
+                    (index - first_index, omm_topology_G.nodes[index]["atomic_number"])
+                    for index in component
+                )
             )
-        for bond in openmm_topology.bonds():
-            omm_topology_G.add_edge(
-                bond.atom1.index, bond.atom2.index, bond_order=bond.order
+            bonds = tuple(
+                sorted(
+                    (
+                        min(index1, index2) - first_index,
+                        max(index1, index2) - first_index,
+                        bond_order if omm_has_bond_orders else None,
+                    )
+                    for index1, index2, bond_order in omm_topology_G.edges(
+                        component, data="bond_order"
+                    )
+                )
             )
+            return first_index, (atoms, bonds)
 
         # For each connected subgraph (molecule) in the topology, find its match in unique_molecules
         topology_molecules_to_add = list()
-        for omm_mol_G in (
-            omm_topology_G.subgraph(c).copy()
-            for c in nx.connected_components(omm_topology_G)
-        ):
+        # Map of component key to the matched unique molecule and the mapping of
+        # (index relative to the first atom, reference index) pairs
+        component_matches = dict()
+        for component in nx.connected_components(omm_topology_G):
+            first_topology_atom_index, key = component_key(component)
+            if key in component_matches:
+                unq_mol, relative_mapping = component_matches[key]
+                topology_molecules_to_add.append(
+                    (
+                        first_topology_atom_index,
+                        unq_mol,
+                        [
+                            (first_topology_atom_index + relative_index, ref_index)
+                            for relative_index, ref_index in relative_mapping
+                        ],
+                    )
+                )
+                continue
+
+            omm_mol_G = omm_topology_G.subgraph(component).copy()
             match_found = False
-            for unq_mol_G in graph_to_unq_mol.keys():
+            candidates = hash_to_unq_mol_graphs[graph_hash(omm_mol_G)]
+            for candidate_index, (unq_mol_G, unq_mol) in enumerate(candidates):
                 isomorphic, mapping = Molecule.are_isomorphic(
                     omm_mol_G,
                     unq_mol_G,
@@ -2147,10 +2840,19 @@ class Topology(Serializable):
                 )
                 if isomorphic:
                     # Take the first valid atom indexing map
-                    first_topology_atom_index = min(mapping.keys())
                     topology_molecules_to_add.append(
-                        (first_topology_atom_index, unq_mol_G, mapping.items())
+                        (first_topology_atom_index, unq_mol, mapping.items())
                     )
+                    component_matches[key] = (
+                        unq_mol,
+                        [
+                            (top_index - first_topology_atom_index, ref_index)
+                            for top_index, ref_index in mapping.items()
+                        ],
+                    )
+                    # Try the most recently matched unique molecule first next time
+                    if candidate_index > 0:
+                        candidates.insert(0, candidates.pop(candidate_index))
                     match_found = True
                     break
             if match_found is False:
@@ -2183,7 +2885,7 @@ class Topology(Serializable):
         # The connected_component_subgraph function above may have scrambled the molecule order, so sort molecules
         # by their first atom's topology index
         topology_molecules_to_add.sort(key=lambda x: x[0])
-        for first_index, unq_mol_G, top_to_ref_index in topology_molecules_to_add:
+        for first_index, unq_mol, top_to_ref_index in topology_molecules_to_add:
             local_top_to_ref_index = dict(
                 [
                     (top_index - first_index, ref_index)
@@ -2191,7 +2893,7 @@ class Topology(Serializable):
                 ]
             )
             topology.add_molecule(
-                graph_to_unq_mol[unq_mol_G],
+                unq_mol,
                 local_topology_to_reference_index=local_top_to_ref_index,
             )
 
@@ -2461,8 +3163,12 @@ class Topology(Serializable):
 
         # Create empty OpenMM Topology
         topology = app.Topology()
-        # Dictionary used to map oe atoms to openmm atoms
-        oe_atom_to_openmm_at = {}
+        # List used to map oe atom indices to openmm atoms
+        oe_atom_index_to_openmm_at = [None] * mol.GetMaxAtomIdx()
+
+        # Bind the calls made for every atom once
+        get_element = app.element.Element.getByAtomicNumber
+        add_atom = topology.addAtom
 
         for chain in hv.GetChains():
             # TODO: Fail if hv contains more than one molecule.
@@ -2481,16 +3187,12 @@ class Topology(Serializable):
 
                     for oe_at in hres.GetAtoms():
                         # Select atom element based on the atomic number
-                        element = app.element.Element.getByAtomicNumber(
-                            oe_at.GetAtomicNum()
-                        )
+                        element = get_element(oe_at.GetAtomicNum())
                         # Add atom OpenMM atom to the topology
-                        openmm_at = topology.addAtom(
-                            oe_at.GetName(), element, openmm_res
-                        )
+                        openmm_at = add_atom(oe_at.GetName(), element, openmm_res)
                         openmm_at.index = oe_at.GetIdx()
-                        # Add atom to the mapping dictionary
-                        oe_atom_to_openmm_at[oe_at] = openmm_at
+                        # Add atom to the mapping list
+                        oe_atom_index_to_openmm_at[openmm_at.index] = openmm_at
 
         if topology.getNumAtoms() != mol.NumAtoms():
             oechem.OEThrow.Error(
@@ -2500,119 +3202,76 @@ class Topology(Serializable):
                 )
             )
 
-        # Count the number of bonds in the openmm topology
-        omm_bond_count = 0
-
-        def IsAmideBond(oe_bond):
-            # TODO: Can this be replaced by a SMARTS query?
-
-            # This supporting function checks if the passed bond is an amide bond or not.
-            # Our definition of amide bond C-N between a Carbon and a Nitrogen atom is:
-            #          O
-            #          ║
-            #  CA or O-C-N-
-            #            |
-
-            # The amide bond C-N is a single bond
-            if oe_bond.GetOrder() != 1:
-                return False
-
-            atomB = oe_bond.GetBgn()
-            atomE = oe_bond.GetEnd()
-
-            # The amide bond is made by Carbon and Nitrogen atoms
-            if not (
-                atomB.IsCarbon()
-                and atomE.IsNitrogen()
-                or (atomB.IsNitrogen() and atomE.IsCarbon())
-            ):
-                return False
-
-            # Select Carbon and Nitrogen atoms
-            if atomB.IsCarbon():
-                C_atom = atomB
-                N_atom = atomE
-            else:
-                C_atom = atomE
-                N_atom = atomB
-
-            # Carbon and Nitrogen atoms must have 3 neighbour atoms
-            if not (C_atom.GetDegree() == 3 and N_atom.GetDegree() == 3):
-                return False
-
-            double_bonds = 0
-            single_bonds = 0
-
-            for bond in C_atom.GetBonds():
-                # The C-O bond can be single or double.
-                if (bond.GetBgn() == C_atom and bond.GetEnd().IsOxygen()) or (
-                    bond.GetBgn().IsOxygen() and bond.GetEnd() == C_atom
-                ):
-                    if bond.GetOrder() == 2:
-                        double_bonds += 1
-                    if bond.GetOrder() == 1:
-                        single_bonds += 1
-                # The CA-C bond is single
-                if (bond.GetBgn() == C_atom and bond.GetEnd().IsCarbon()) or (
-                    bond.GetBgn().IsCarbon() and bond.GetEnd() == C_atom
-                ):
-                    if bond.GetOrder() == 1:
-                        single_bonds += 1
-            # Just one double and one single bonds are connected to C
-            # In this case the bond is an amide bond
-            if double_bonds == 1 and single_bonds == 1:
-                return True
-            else:
-                return False
+        # Find all amide bonds with a single substructure search. Our definition of
+        # amide bond C-N is a single bond between a Carbon and a Nitrogen atom with
+        # 3 neighbours each, where the Carbon has one double bond to an Oxygen and
+        # one single bond to a Carbon or Oxygen:
+        #          O
+        #          ║
+        #  CA or O-C-N-
+        #            |
+        amide_search = oechem.OESubSearch("[#6X3:1](=[#8])(-[#6,#8])-[#7X3:2]")
+        amide_search.SetMaxMatches(0)
+        oechem.OEPrepareSearch(mol, amide_search)
+        amide_bond_indices = set()
+        for match in amide_search.Match(mol, True):
+            amide_atoms = [
+                matched_atom.target
+                for matched_atom in match.GetAtoms()
+                if matched_atom.pattern.GetMapIdx() != 0
+            ]
+            amide_bond_indices.add(mol.GetBond(*amide_atoms).GetIdx())
+
+        # Bond types that are kept as they are, and the types given to untyped
+        # non-aromatic, non-amide bonds by bond order
+        known_bond_types = {"Single", "Double", "Triple", "Aromatic", "Amide"}
+        bond_types_by_order = {1: "Single", 2: "Double", 3: "Triple"}
+
+        # Bind the call made for every bond once
+        add_bond = topology.addBond
 
         # Creating bonds
         for oe_bond in mol.GetBonds():
+            # Query each bond once, rather than once per check
+            bond_type = oe_bond.GetType()
+            bond_order = oe_bond.GetOrder()
             # Set the bond type
-            if oe_bond.GetType() != "":
-                if oe_bond.GetType() in [
-                    "Single",
-                    "Double",
-                    "Triple",
-                    "Aromatic",
-                    "Amide",
-                ]:
-                    off_bondtype = oe_bond.GetType()
-                else:
-                    off_bondtype = None
+            if bond_type != "":
+                off_bondtype = bond_type if bond_type in known_bond_types else None
             else:
                 if oe_bond.IsAromatic():
-                    oe_bond.SetType("Aromatic")
                     off_bondtype = "Aromatic"
-                elif oe_bond.GetOrder() == 2:
-                    oe_bond.SetType("Double")
-                    off_bondtype = "Double"
-                elif oe_bond.GetOrder() == 3:
-                    oe_bond.SetType("Triple")
-                    off_bondtype = "Triple"
-                elif IsAmideBond(oe_bond):
-                    oe_bond.SetType("Amide")
+                elif oe_bond.GetIdx() in amide_bond_indices:
+                    # Amide bonds are single bonds, so this does not hide any other type
                     off_bondtype = "Amide"
-                elif oe_bond.GetOrder() == 1:
-                    oe_bond.SetType("Single")
-                    off_bondtype = "Single"
                 else:
-                    off_bondtype = None
+                    off_bondtype = bond_types_by_order.get(bond_order)
+                if off_bondtype is not None:
+                    oe_bond.SetType(off_bondtype)
 
-            molecule.add_bond(
-                oe_atom_to_openmm_at[oe_bond.GetBgn()],
-                oe_atom_to_openmm_at[oe_bond.GetEnd()],
+            add_bond(
+                oe_atom_index_to_openmm_at[oe_bond.GetBgnIdx()],
+                oe_atom_index_to_openmm_at[oe_bond.GetEndIdx()],
                 type=off_bondtype,
-                order=oe_bond.GetOrder(),
+                order=bond_order,
             )
 
-        if molecule.n_bondsphe != mol.NumBonds():
+        if topology.getNumBonds() != mol.NumBonds():
             oechem.OEThrow.Error(
                 "OpenMM topology and OEMol number of bonds mismatching: "
-                "OpenMM = {} vs OEMol  = {}".format(omm_bond_count, mol.NumBonds())
+                "OpenMM = {} vs OEMol  = {}".format(
+                    topology.getNumBonds(), mol.NumBonds()
+                )
             )
 
+        # Read the coordinates straight into one (n_atoms, 3) array, in atom index order
         dic = mol.GetCoords()
-        positions = [Vec3(v[0], v[1], v[2]) for k, v in dic.items()] * unit.angstrom
+        coordinates = np.fromiter(
+            itertools.chain.from_iterable(dic.values()),
+            dtype=np.float64,
+            count=3 * len(dic),
+        ).reshape(-1, 3)
+        positions = unit.Quantity(coordinates, unit.angstrom)
 
         return topology, positions
 
@@ -2641,8 +3300,9 @@ class Topology(Serializable):
         """
         oe_mol = oechem.OEMol()
 
-        # Python set used to identify atoms that are not in protein residues
-        keep = set(proteinResidues).union(dnaResidues).union(rnaResidues)
+        # Bind the OEChem calls made for every atom once
+        new_atom = oe_mol.NewAtom
+        set_atom_residue = oechem.OEAtomSetResidue
 
         for chain in topology.chains():
             for res in chain.residues():
@@ -2652,7 +3312,7 @@ class Topology(Serializable):
                 oe_res.SetName(res.name)
                 # If the atom is not a protein atom then set its heteroatom
                 # flag to True
-                if res.name not in keep:
+                if res.name not in _BIOPOLYMER_RESIDUE_NAMES:
                     oe_res.SetFragmentNumber(chain.index + 1)
                     oe_res.SetHetAtom(True)
                 # Set OEResidue Chain ID
@@ -2661,17 +3321,20 @@ class Topology(Serializable):
                 # Set OEResidue number
                 oe_res.SetResidueNumber(int(res.id))
 
+                set_serial_number = oe_res.SetSerialNumber
+
                 for openmm_at in res.atoms():
+                    element = openmm_at.element
                     # Create an OEAtom  based on the atomic number
-                    oe_atom = oe_mol.NewAtom(openmm_at.element._atomic_number)
+                    oe_atom = new_atom(element._atomic_number)
                     # Set atom name
                     oe_atom.SetName(openmm_at.name)
                     # Set Symbol
-                    oe_atom.SetType(openmm_at.element.symbol)
+                    oe_atom.SetType(element.symbol)
                     # Set Atom index
-                    oe_res.SetSerialNumber(openmm_at.index + 1)
+                    set_serial_number(openmm_at.index + 1)
                     # Commit the changes
-                    oechem.OEAtomSetResidue(oe_atom, oe_res)
+                    set_atom_residue(oe_atom, oe_res)
                     # Update the dictionary OpenMM to OE
                     openmm_atom_to_oe_atom[openmm_at] = oe_atom
 
@@ -2684,8 +3347,9 @@ class Topology(Serializable):
             )
 
         # Create bonds
+        new_bond = oe_mol.NewBond
         for off_bond in self.topology_bonds():
-            oe_mol.NewBond(oe_atoms[bond.atom1], oe_atoms[bond.atom2], bond.bond_order)
+            new_bond(oe_atoms[bond.atom1], oe_atoms[bond.atom2], bond.bond_order)
             if off_bond.type:
                 if off_bond.type == "Aromatic":
                     oe_atom0.SetAromatic(True)
@@ -2707,12 +3371,14 @@ class Topology(Serializable):
 
         if positions is not None:
             # Set the OEMol positions
-            particle_indices = [
-                atom.particle_index for atom in self.topology_atoms
-            ]  # get particle indices
-            pos = positions[particle_indices].value_in_units_of(unit.angstrom)
-            pos = list(itertools.chain.from_iterable(pos))
-            oe_mol.SetCoords(pos)
+            # Atoms are listed before all virtual sites, so the topology particle index of
+            # each atom is its topology atom index and the atom positions come first.
+            # Flatten in NumPy, and hand OEChem a single flat sequence of floats
+            pos = np.asarray(
+                positions[: self.n_topology_atoms].value_in_unit(unit.angstrom),
+                dtype=np.float64,
+            )
+            oe_mol.SetCoords(oechem.OEFloatArray(pos.ravel().tolist()))
             oechem.OESetDimensionFromCoords(oe_mol)
 
         return oe_mol
@@ -2731,24 +3397,30 @@ class Topology(Serializable):
             The bond between i and j.
 
         """
-        if (type(i) is int) and (type(j) is int):
+        if isinstance(i, (int, np.integer)) and isinstance(j, (int, np.integer)):
             atomi = self.atom(i)
             atomj = self.atom(j)
-        elif (type(i) is TopologyAtom) and (type(j) is TopologyAtom):
+        elif isinstance(i, TopologyAtom) and isinstance(j, TopologyAtom):
             atomi = i
             atomj = j
         else:
             raise Exception(
-                "Invalid input passed to is_bonded(). Expected ints or TopologyAtoms, "
+                "Invalid input passed to get_bond_between(). Expected ints or TopologyAtoms, "
                 "got {} and {}".format(i, j)
             )
 
-        for top_bond in atomi.topology_bonds:
-            for top_atom in top_bond.atoms:
-                if top_atom == atomi:
-                    continue
-                if top_atom == atomj:
-                    return top_bond
+        # Atoms can only be bonded within one TopologyMolecule, where they are bonded
+        # if their reference atoms are
+        topology_molecule = atomi.topology_molecule
+        if topology_molecule is atomj.topology_molecule:
+            row_ptr, neighbors, bond_indices = atomi.atom.molecule._bond_graph_csr
+            index = atomi.atom.molecule_atom_index
+            start = row_ptr[index]
+            neighbors_of_i = neighbors[start : row_ptr[index + 1]].tolist()
+            j_index = atomj.atom.molecule_atom_index
+            if j_index in neighbors_of_i:
+                bond_index = bond_indices[start + neighbors_of_i.index(j_index)]
+                return topology_molecule._topology_bonds[bond_index]
 
         raise NotBondedError("No bond between atom {} and {}".format(i, j))
 
@@ -2766,11 +3438,34 @@ class Topology(Serializable):
             True if atoms are bonded, False otherwise.
 
         """
-        try:
-            self.get_bond_between(i, j)
-            return True
-        except NotBondedError:
-            return False
+        # Atoms can only be bonded within one TopologyMolecule, where they are bonded if
+        # their reference atoms are. This is looked up in the reference bond graph, without
+        # creating TopologyAtoms or TopologyBonds
+        if isinstance(i, (int, np.integer)) and isinstance(j, (int, np.integer)):
+            assert 0 <= i < self.n_topology_atoms
+            assert 0 <= j < self.n_topology_atoms
+            atom_starts = self._atom_start_topology_indices
+            topology_molecule_index = bisect_right(atom_starts, i) - 1
+            if bisect_right(atom_starts, j) - 1 != topology_molecule_index:
+                return False
+            topology_molecule = self._topology_molecules[topology_molecule_index]
+            start = atom_starts[topology_molecule_index]
+            ref_i = topology_molecule._top_to_ref_index[i - start]
+            ref_j = topology_molecule._top_to_ref_index[j - start]
+        elif isinstance(i, TopologyAtom) and isinstance(j, TopologyAtom):
+            topology_molecule = i.topology_molecule
+            if j.topology_molecule is not topology_molecule:
+                return False
+            ref_i = i.atom.molecule_atom_index
+            ref_j = j.atom.molecule_atom_index
+        else:
+            raise Exception(
+                "Invalid input passed to is_bonded(). Expected ints or TopologyAtoms, "
+                "got {} and {}".format(i, j)
+            )
+
+        row_ptr, neighbors, _ = topology_molecule.reference_molecule._bond_graph_csr
+        return ref_j in neighbors[row_ptr[ref_i] : row_ptr[ref_i + 1]].tolist()
 
     def atom(self, atom_topology_index):
         """
@@ -2785,27 +3480,20 @@ class Topology(Serializable):
         -------
         An openff.toolkit.topology.TopologyAtom
         """
-        assert type(atom_topology_index) is int
+        assert isinstance(atom_topology_index, (int, np.integer))
         assert 0 <= atom_topology_index < self.n_topology_atoms
-        this_molecule_start_index = 0
-        next_molecule_start_index = 0
-        for topology_molecule in self._topology_molecules:
-            next_molecule_start_index += topology_molecule.n_atoms
-            if next_molecule_start_index > atom_topology_index:
-                atom_molecule_index = atom_topology_index - this_molecule_start_index
-                # NOTE: the index here should still be in the topology index order, NOT the reference molecule's
-                return topology_molecule.atom(atom_molecule_index)
-            this_molecule_start_index += topology_molecule.n_atoms
-
-        # Potentially more computationally efficient lookup ( O(largest_molecule_natoms)? )
-        # start_index_2_top_mol is an ordered dict of [starting_atom_index] --> [topology_molecule]
-        # search_range = range(atom_topology_index - largest_molecule_natoms, atom_topology_index)
-        # search_index = atom_topology_index
-        # while not(search_index in start_index_2_top_mol.keys()): # Only efficient if start_index_2_top_mol.keys() is a set (constant time lookups)
-        #     search_index -= 1
-        # topology_molecule = start_index_2_top_mol(search_index)
-        # atom_molecule_index = atom_topology_index - search_index
-        # return topology_molecule.atom(atom_molecule_index)
+        # The last TopologyMolecule starting at or before this index is the one that
+        # holds it, since molecules before it with the same start have no atoms
+        topology_molecule_index = (
+            bisect_right(self._atom_start_topology_indices, atom_topology_index) - 1
+        )
+        topology_molecule = self._topology_molecules[topology_molecule_index]
+        atom_molecule_index = (
+            atom_topology_index
+            - self._atom_start_topology_indices[topology_molecule_index]
+        )
+        # NOTE: the index here should still be in the topology index order, NOT the reference molecule's
+        return topology_molecule.atom(atom_molecule_index)
 
     def virtual_site(self, vsite_topology_index):
         """
@@ -2821,16 +3509,21 @@ class Topology(Serializable):
         An openff.toolkit.topology.TopologyVirtualSite
 
         """
-        assert type(vsite_topology_index) is int
+        assert isinstance(vsite_topology_index, (int, np.integer))
         assert 0 <= vsite_topology_index < self.n_topology_virtual_sites
-        this_molecule_start_index = 0
-        next_molecule_start_index = 0
-        for topology_molecule in self._topology_molecules:
-            next_molecule_start_index += topology_molecule.n_virtual_sites
-            if next_molecule_start_index > vsite_topology_index:
-                vsite_molecule_index = vsite_topology_index - this_molecule_start_index
-                return topology_molecule.virtual_site(vsite_molecule_index)
-            this_molecule_start_index += topology_molecule.n_virtual_sites
+        virtual_site_starts, _ = self._virtual_start_topology_indices()
+        topology_molecule_index = (
+            int(
+                np.searchsorted(virtual_site_starts, vsite_topology_index, side="right")
+            )
+            - 1
+        )
+        vsite_molecule_index = vsite_topology_index - int(
+            virtual_site_starts[topology_molecule_index]
+        )
+        return self._topology_molecules[topology_molecule_index].virtual_site(
+            vsite_molecule_index
+        )
 
     def bond(self, bond_topology_index):
         """
@@ -2845,16 +3538,17 @@ class Topology(Serializable):
         -------
         An openff.toolkit.topology.TopologyBond
         """
-        assert type(bond_topology_index) is int
+        assert isinstance(bond_topology_index, (int, np.integer))
         assert 0 <= bond_topology_index < self.n_topology_bonds
-        this_molecule_start_index = 0
-        next_molecule_start_index = 0
-        for topology_molecule in self._topology_molecules:
-            next_molecule_start_index += topology_molecule.n_bonds
-            if next_molecule_start_index > bond_topology_index:
-                bond_molecule_index = bond_topology_index - this_molecule_start_index
-                return topology_molecule.bond(bond_molecule_index)
-            this_molecule_start_index += topology_molecule.n_bonds
+        topology_molecule_index = (
+            bisect_right(self._bond_start_topology_indices, bond_topology_index) - 1
+        )
+        topology_molecule = self._topology_molecules[topology_molecule_index]
+        bond_molecule_index = (
+            bond_topology_index
+            - self._bond_start_topology_indices[topology_molecule_index]
+        )
+        return topology_molecule.bond(bond_molecule_index)
 
     def add_particle(self, particle):
         """Add a Particle to the Topology.
@@ -2875,7 +3569,8 @@ class Topology(Serializable):
         Parameters
         ----------
         molecule : Molecule
-            The Molecule to be added.
+            The Molecule to be added. If it is a new unique molecule, a FrozenMolecule copy of it is stored as the
+            reference molecule, unless it is a FrozenMolecule itself, which is stored without copying.
         local_topology_to_reference_index: dict, optional, default = None
             Dictionary of {TopologyMolecule_atom_index : Molecule_atom_index} for the TopologyMolecule that will be
             built. If None, this function will add the atoms to the Topology in the order that they appear in the
@@ -2894,40 +3589,70 @@ class Topology(Serializable):
             )
 
         mol_smiles = molecule.to_smiles()
-        reference_molecule = None
-        for potential_ref_mol in self._reference_molecule_to_topology_molecules.keys():
-            if mol_smiles == potential_ref_mol.to_smiles():
-                # If the molecule is already in the Topology.reference_molecules, add another reference to it in
-                # Topology.molecules
-                reference_molecule = potential_ref_mol
-
-                # Graph-match this molecule to see if it's in the same order
-                # Default settings use full matching
-                _, atom_map = Molecule.are_isomorphic(
-                    molecule, reference_molecule, return_atom_map=True
-                )
-                if atom_map is None:
-                    raise Exception(1)
-                new_mapping = {}
-                for local_top_idx, ref_idx in local_topology_to_reference_index.items():
-                    new_mapping[local_top_idx] = atom_map[ref_idx]
-                local_topology_to_reference_index = new_mapping
-                # raise Exception(local_topology_to_reference_index)
-                break
-        if reference_molecule is None:
-            # If it's a new unique molecule, make and store an immutable copy of it
-            reference_molecule = FrozenMolecule(molecule)
+        reference_molecule = self._smiles_to_reference_molecule.get(mol_smiles)
+        if reference_molecule is not None:
+            # If the molecule is already in the Topology.reference_molecules, add another reference to it in
+            # Topology.molecules
+
+            # Graph-match this molecule to see if it's in the same order
+            # Default settings use full matching
+            _, atom_map = Molecule.are_isomorphic(
+                molecule, reference_molecule, return_atom_map=True
+            )
+            if atom_map is None:
+                raise Exception(1)
+            new_mapping = {}
+            for local_top_idx, ref_idx in local_topology_to_reference_index.items():
+                new_mapping[local_top_idx] = atom_map[ref_idx]
+            local_topology_to_reference_index = new_mapping
+        else:
+            # If it's a new unique molecule, make and store an immutable copy of it. A
+            # FrozenMolecule is already immutable, so it is stored as it is
+            if type(molecule) is FrozenMolecule:
+                reference_molecule = molecule
+            else:
+                reference_molecule = FrozenMolecule(molecule)
+            self._smiles_to_reference_molecule[mol_smiles] = reference_molecule
             self._reference_molecule_to_topology_molecules[reference_molecule] = list()
+            self._atom_start_topology_index_groups[reference_molecule] = list()
 
-        topology_molecule = TopologyMolecule(
-            reference_molecule, self, local_topology_to_reference_index
-        )
+        other_topology_molecules = self._reference_molecule_to_topology_molecules[
+            reference_molecule
+        ]
+        atom_start_groups = self._atom_start_topology_index_groups[reference_molecule]
+        if (
+            other_topology_molecules
+            and other_topology_molecules[-1]._top_to_ref_index
+            == local_topology_to_reference_index
+        ):
+            topology_molecule = other_topology_molecules[-1]._new_copy()
+            # The previous copy is always in the last group
+            group = atom_start_groups[-1]
+        else:
+            topology_molecule = TopologyMolecule(
+                reference_molecule, self, local_topology_to_reference_index
+            )
+            group = [topology_molecule, np.empty(1, dtype=np.int32), 0]
+            atom_start_groups.append(group)
+        if group[2] == len(group[1]):
+            # Grow the buffer geometrically, so adding many copies stays linear
+            group[1] = np.resize(group[1], 2 * len(group[1]))
+        group[1][group[2]] = self._n_topology_atoms
+        group[2] += 1
+        # Molecules are only ever appended, so the atoms and bonds of the new molecule
+        # start after those already in the topology
+        index = len(self._topology_molecules)
+        topology_molecule._topology_molecule_index = index
+        topology_molecule._atom_start_topology_index = self._n_topology_atoms
+        topology_molecule._bond_start_topology_index = self._n_topology_bonds
         self._topology_molecules.append(topology_molecule)
-        self._reference_molecule_to_topology_molecules[reference_molecule].append(
-            self._topology_molecules[-1]
-        )
+        self._chemical_environment_matches_cache.clear()
+        self._atom_start_topology_indices.append(self._n_topology_atoms)
+        self._bond_start_topology_indices.append(self._n_topology_bonds)
+        self._n_topology_atoms += topology_molecule.n_atoms
+        self._n_topology_bonds += topology_molecule.n_bonds
+        other_topology_molecules.append(topology_molecule)
 
-        index = len(self._topology_molecules) - 1
         return index
 
     def add_constraint(self, iatom, jatom, distance=True):
@@ -2948,8 +3673,9 @@ class Topology(Serializable):
 
         """
         # Check that constraint hasn't already been specified.
-        if (iatom, jatom) in self._constrained_atom_pairs:
-            existing_distance = self._constrained_atom_pairs[(iatom, jatom)]
+        key = self._constrained_atom_pair_key(iatom, jatom)
+        if key in self._constrained_atom_pairs:
+            existing_distance = self._constrained_atom_pairs[key]
             if unit.is_quantity(existing_distance) and (distance is True):
                 raise Exception(
                     f"Atoms ({iatom},{jatom}) already constrained with distance {existing_distance} but attempting to override with unspecified distance"
@@ -2959,12 +3685,17 @@ class Topology(Serializable):
                     f"Atoms ({iatom},{jatom}) already constrained with unspecified distance but attempting to override with unspecified distance"
                 )
             if distance is False:
-                del self._constrained_atom_pairs[(iatom, jatom)]
-                del self._constrained_atom_pairs[(jatom, iatom)]
+                del self._constrained_atom_pairs[key]
                 return
 
-        self._constrained_atom_pairs[(iatom, jatom)] = distance
-        self._constrained_atom_pairs[(jatom, iatom)] = distance
+        self._constrained_atom_pairs[key] = distance
+
+    @staticmethod
+    def _constrained_atom_pair_key(iatom, jatom):
+        """Order a pair of atom indices, so that each constrained pair is only stored once"""
+        if iatom <= jatom:
+            return (iatom, jatom)
+        return (jatom, iatom)
 
     def is_constrained(self, iatom, jatom):
         """
@@ -2982,7 +3713,6 @@ class Topology(Serializable):
             Distance if constraint has already been added to System
 
         """
-        if (iatom, jatom) in self._constrained_atom_pairs:
-            return self._constrained_atom_pairs[(iatom, jatom)]
-        else:
-            return False
+        return self._constrained_atom_pairs.get(
+            self._constrained_atom_pair_key(iatom, jatom), False
+        )
@@ -37,7 +37,7 @@ import os
 import pathlib
 from collections import OrderedDict
 
-from simtk import openmm
+from simtk import openmm, unit
 
 from openff.toolkit.topology.molecule import DEFAULT_AROMATICITY_MODEL
 from openff.toolkit.typing.engines.smirnoff.io import ParameterIOHandler
@@ -708,21 +708,24 @@ class ForceField:
             assigned_set = set([atomset[0] for atomset in assigned_terms])
 
         def render_atoms(atomsets):
-            msg = ""
+            lines = []
             for atomset in atomsets:
-                msg += f"{atomset:30} :"
+                line = [f"{atomset:30} :"]
                 try:
                     for atom_index in atomset:
                         atom = atoms[atom_index]
-                        msg += f" {atom.residue.index:5} {atom.residue.name:3} {atom.name:3}"
+                        line.append(
+                            f" {atom.residue.index:5} {atom.residue.name:3} {atom.name:3}"
+                        )
                 except TypeError as te:
                     atom = atoms[atomset]
-                    msg += (
+                    line.append(
                         f" {atom.residue.index:5} {atom.residue.name:3} {atom.name:3}"
                     )
 
-                msg += "\n"
-            return msg
+                line.append("\n")
+                lines.append("".join(line))
+            return "".join(lines)
 
         if set(assigned_set) != set(topology_set):
             # Form informative error message
@@ -1305,9 +1308,10 @@ class ForceField:
         if topology.box_vectors is not None:
             system.setDefaultPeriodicBoxVectors(*topology.box_vectors)
 
-        # Add particles (both atoms and virtual sites) with appropriate masses
-        for atom in topology.topology_particles:
-            system.addParticle(atom.atom.mass)
+        # Add atom particles with appropriate masses. Virtual site particles are added
+        # by the VirtualSiteHandler.
+        for mass in topology.masses_array().value_in_unit(unit.dalton).tolist():
+            system.addParticle(mass)
 
         # Determine the order in which to process ParameterHandler objects in order to satisfy dependencies
         parameter_handlers = self._resolve_parameter_handler_order()
@@ -5746,7 +5746,7 @@ class VirtualSiteHandler(_NonbondedHandler):
         """
 
         for vsite in ref_mol.virtual_sites:
-            ref_key = [atom.molecule_atom_index for atom in vsite.atoms]
+            ref_key = vsite._atom_indices.tolist()
             logger.debug("VSite ref_key: {}".format(ref_key))
 
             ms = topology._reference_molecule_to_topology_molecules[ref_mol]
@@ -93,6 +93,9 @@ class Serializable(abc.ABC):
 
     """
 
+    # Empty, so that subclasses may declare __slots__ of their own
+    __slots__ = ()
+
     @abc.abstractmethod
     def to_dict(self):
         pass